@@ -1,13 +1,21 @@
+import asyncio
 from quart import Quart
 from quart_cors import cors
 from quart_jwt_extended import JWTManager
 from app.config import config_by_name
+from app.extensions import commit_session, close_session
+from app.cache import EntityCache, ResponseCache
+from app.repositories.singleflight import SingleFlight
+from app.passwords import PasswordHasher
+from app.json_provider import FastJSONProvider
+from app.models.upgrade import upgrade_database
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.api.auth import auth_bp
 from app.api.authors import authors_bp
 from app.api.books import books_bp
 from app.api.publishers import publishers_bp
+from app.api.metrics import metrics_bp
 from app.errors import errors_bp
 from app.swagger import swagger_bp
 
@@ -16,6 +24,7 @@ def create_app(config_name="development"):
     app = Quart(__name__)
     app = cors(app, allow_origin="*")
     app.config.from_object(config_by_name[config_name])
+    app.json = FastJSONProvider(app)
 
     # Set up async SQLAlchemy engine and session
     db_url = app.config.get("SQLALCHEMY_DATABASE_URI")
@@ -26,16 +35,42 @@ def create_app(config_name="development"):
     # Attach to app context for use in repositories
     app.async_engine = engine
     app.async_session = session
+    app.entity_cache = EntityCache(
+        app.config["ENTITY_CACHE_SIZE"], app.config["ENTITY_CACHE_TTL"]
+    )
+    app.negative_cache = EntityCache(
+        app.config["NEGATIVE_CACHE_SIZE"], app.config["NEGATIVE_CACHE_TTL"]
+    )
+    app.response_cache = ResponseCache(
+        app.config["RESPONSE_CACHE_MAX_BYTES"], app.config["RESPONSE_CACHE_TTL"]
+    )
+    app.single_flight = SingleFlight()
+    app.password_hasher = PasswordHasher(
+        app.config["PASSWORD_HASH_METHOD"], app.config["PASSWORD_HASH_WORKERS"]
+    )
+    # One session and transaction per request, committed after the handler
+    app.after_request(commit_session)
+    app.teardown_appcontext(close_session)
     app.register_blueprint(errors_bp)
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
     app.register_blueprint(authors_bp, url_prefix="/api/authors")
     app.register_blueprint(books_bp, url_prefix="/api/books")
     app.register_blueprint(publishers_bp, url_prefix="/api/publishers")
+    app.register_blueprint(metrics_bp, url_prefix="/api/metrics")
     app.register_blueprint(swagger_bp)
 
+    @app.after_serving
+    async def shutdown_password_hasher():
+        app.password_hasher.shutdown()
+
     # Initialize JWTManager
     JWTManager(app)
 
+    @app.cli.command("upgrade-db")
+    def upgrade_db():
+        """Add missing columns, indexes and search tables to the database."""
+        asyncio.run(upgrade_database(engine))
+
     @app.shell_context_processor
     def shell_context():
         return {"async_engine": engine, "async_session": session, "app": app}
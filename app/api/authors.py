@@ -1,44 +1,89 @@
-from quart import Blueprint, request, jsonify
+from quart import Blueprint, current_app, request, jsonify
 from quart_jwt_extended import jwt_required
 from app.services.author_service import AuthorService
+from app.services.book_service import BookService
 from app.schemas.author import AuthorSchema
+from app.schemas.book import BookSchema
+from app.cache import cached_response
+from app.api.export import export_response
+from app.api.paging import per_page_arg
+from app.api.fields import BOOK_RELATIONS, requested_fields
+from app.api.etag import conditional_jsonify, book_version, owner_version
+from app.schemas.compiled import compile_schema
 from marshmallow import ValidationError
 
 authors_bp = Blueprint("authors", __name__)
 author_schema = AuthorSchema()
-authors_schema = AuthorSchema(many=True)
+authors_schema = compile_schema(AuthorSchema(many=True), native=True)
+books_schema = compile_schema(BookSchema(many=True), native=True)
 
 @authors_bp.route("", methods=["GET"])
+@cached_response("authors", "books")
 async def get_authors():
+    try:
+        fields = requested_fields(authors_schema)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
     page = int(request.args.get("page", 1))
-    per_page = int(request.args.get("per_page", 10))
+    per_page = per_page_arg()
     name = request.args.get("name", "")
-    if name:
-        result, status_code = await AuthorService.search_by_name(name, page, per_page)
+    if "cursor" in request.args:
+        cursor = request.args.get("cursor")
+        result, status_code = await AuthorService.get_all_after(
+            cursor, per_page, fields=fields, name=name
+        )
+    elif name:
+        result, status_code = await AuthorService.search_by_name(
+            name, page, per_page, fields=fields
+        )
     else:
-        result, status_code = await AuthorService.get_all(page, per_page)
-    if result["success"] and "data" in result:
-        result["data"] = authors_schema.dump(result["data"])
-    return jsonify(result), status_code
+        result, status_code = await AuthorService.get_all(page, per_page, fields=fields)
+    return conditional_jsonify(
+        result, status_code, authors_schema, owner_version, fields
+    )
+
+@authors_bp.route("/export", methods=["GET"])
+async def export_authors():
+    batch_size = current_app.config["EXPORT_BATCH_SIZE"]
+    result, status_code = await AuthorService.export(batch_size)
+    return export_response(result, status_code, "authors")
 
 @authors_bp.route("/<int:author_id>", methods=["GET"])
 async def get_author(author_id):
+    try:
+        fields = requested_fields(author_schema)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
     result, status_code = await AuthorService.get_by_id(author_id)
-    if result["success"]:
-        result["data"] = author_schema.dump(result["data"])
-    return jsonify(result), status_code
+    return conditional_jsonify(
+        result, status_code, author_schema, owner_version, fields
+    )
+
+@authors_bp.route("/<int:author_id>/books", methods=["GET"])
+@cached_response("books", "authors", "publishers")
+async def get_author_books(author_id):
+    try:
+        fields = requested_fields(books_schema, BOOK_RELATIONS)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    page = int(request.args.get("page", 1))
+    per_page = per_page_arg()
+    result, status_code = await BookService.get_by_author(
+        author_id, page, per_page, fields=fields
+    )
+    return conditional_jsonify(result, status_code, books_schema, book_version, fields)
 
 @authors_bp.route("/", methods=["POST"])
 @jwt_required
 async def create_author():
-    author_data = await request.get_json()
-    validation_errors = author_schema.validate(author_data)
-    if validation_errors:
+    try:
+        author_data = author_schema.load(await request.get_json())
+    except ValidationError as err:
         return (
             jsonify({
                 "success": False,
                 "message": "Validation error",
-                "errors": validation_errors,
+                "errors": err.messages,
             }),
             400,
         )
@@ -50,14 +95,14 @@ async def create_author():
 @authors_bp.route("/<int:author_id>", methods=["PUT"])
 @jwt_required
 async def update_author(author_id):
-    author_data = await request.get_json()
-    validation_errors = author_schema.validate(author_data, partial=True)
-    if validation_errors:
+    try:
+        author_data = author_schema.load(await request.get_json(), partial=True)
+    except ValidationError as err:
         return (
             jsonify({
                 "success": False,
                 "message": "Validation error",
-                "errors": validation_errors,
+                "errors": err.messages,
             }),
             400,
         )
@@ -72,12 +117,19 @@ async def delete_author(author_id):
     result, status_code = await AuthorService.delete(author_id)
     return jsonify(result), status_code
 
-authors_bp.route("/search", methods=["GET"])
+@authors_bp.route("/search", methods=["GET"])
+@cached_response("authors", "books")
 async def search_authors():
+    try:
+        fields = requested_fields(authors_schema)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
     name = request.args.get("name", "")
     page = int(request.args.get("page", 1))
-    per_page = int(request.args.get("per_page", 10))
-    result, status_code = await AuthorService.search_by_name(name, page, per_page)
-    if result["success"] and "data" in result:
-        result["data"] = authors_schema.dump(result["data"])
-    return jsonify(result), status_code
+    per_page = per_page_arg()
+    result, status_code = await AuthorService.search_by_name(
+        name, page, per_page, fields=fields
+    )
+    return conditional_jsonify(
+        result, status_code, authors_schema, owner_version, fields
+    )
@@ -1,44 +1,83 @@
-from quart import Blueprint, request, jsonify
+from quart import Blueprint, current_app, request, jsonify
 from quart_jwt_extended import jwt_required
 from app.services.book_service import BookService
 from app.schemas.book import BookSchema
+from app.cache import cached_response
+from app.api.columnar import columnar_response, wants_columns
+from app.api.export import export_response
+from app.api.paging import per_page_arg
+from app.api.fields import BOOK_RELATIONS, requested_fields
+from app.api.etag import conditional_jsonify, book_version
+from app.schemas.compiled import compile_schema
 from marshmallow import ValidationError
 
 books_bp = Blueprint("books", __name__)
 book_schema = BookSchema()
-books_schema = BookSchema(many=True)
+books_schema = compile_schema(BookSchema(many=True), native=True)
+
+@books_bp.after_request
+async def vary_on_accept(response):
+    # Lists are negotiated between JSON and columnar JSON
+    if request.endpoint in ("books.get_books", "books.search_books"):
+        response.vary.add("Accept")
+    return response
 
 @books_bp.route("", methods=["GET"])
+@cached_response("books", "authors", "publishers")
 async def get_books():
+    try:
+        fields = requested_fields(books_schema, BOOK_RELATIONS)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    columns = wants_columns()
+    if columns and fields is None:
+        fields = tuple(sorted(books_schema.schema.dump_fields))
     page = int(request.args.get("page", 1))
-    per_page = int(request.args.get("per_page", 10))
+    per_page = per_page_arg()
     title = request.args.get("title", "")
-    if title:
-        result, status_code = await BookService.search_by_title(title, page, per_page)
+    if "cursor" in request.args:
+        cursor = request.args.get("cursor")
+        result, status_code = await BookService.get_all_after(
+            cursor, per_page, fields=fields, columns=columns, title=title
+        )
+    elif title:
+        result, status_code = await BookService.search_by_title(
+            title, page, per_page, fields=fields, columns=columns
+        )
     else:
-        result, status_code = await BookService.get_all(page, per_page)
-    if result["success"] and "data" in result:
-        result["data"] = books_schema.dump(result["data"])
-    return jsonify(result), status_code
+        result, status_code = await BookService.get_all(
+            page, per_page, fields=fields, columns=columns
+        )
+    if columns:
+        return columnar_response(result, status_code)
+    return conditional_jsonify(result, status_code, books_schema, book_version, fields)
+
+@books_bp.route("/export", methods=["GET"])
+async def export_books():
+    batch_size = current_app.config["EXPORT_BATCH_SIZE"]
+    result, status_code = await BookService.export(batch_size)
+    return export_response(result, status_code, "books")
 
 @books_bp.route("/<int:book_id>", methods=["GET"])
 async def get_book(book_id):
+    try:
+        fields = requested_fields(book_schema, BOOK_RELATIONS)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
     result, status_code = await BookService.get_by_id(book_id)
-    if result["success"]:
-        result["data"] = book_schema.dump(result["data"])
-    return jsonify(result), status_code
+    return conditional_jsonify(result, status_code, book_schema, book_version, fields)
 
 @books_bp.route("/", methods=["POST"])
 @jwt_required
 async def create_book():
-    book_data = await request.get_json()
-    validation_errors = book_schema.validate(book_data)
-    if validation_errors:
+    try:
+        book_data = book_schema.load(await request.get_json())
+    except ValidationError as err:
         return (
             jsonify({
                 "success": False,
                 "message": "Validation error",
-                "errors": validation_errors,
+                "errors": err.messages,
             }),
             400,
         )
@@ -47,17 +86,46 @@ async def create_book():
         result["data"] = book_schema.dump(result["data"])
     return jsonify(result), status_code
 
+@books_bp.route("/bulk", methods=["POST"])
+@jwt_required
+async def bulk_create_books():
+    items = await request.get_json()
+    max_books = current_app.config["BULK_MAX_BOOKS"]
+    if not isinstance(items, list) or not items:
+        return (
+            jsonify({"success": False, "message": "Expected a non-empty list of books"}),
+            400,
+        )
+    if len(items) > max_books:
+        return (
+            jsonify({
+                "success": False,
+                "message": f"At most {max_books} books can be created at once",
+            }),
+            400,
+        )
+    books = {}
+    errors = {}
+    for index, item in enumerate(items):
+        try:
+            books[index] = book_schema.load(item)
+        except ValidationError as err:
+            errors[index] = err.messages
+    batch_size = current_app.config["BULK_BATCH_SIZE"]
+    result, status_code = await BookService.bulk_create(books, errors, batch_size)
+    return jsonify(result), status_code
+
 @books_bp.route("/<int:book_id>", methods=["PUT"])
 @jwt_required
 async def update_book(book_id):
-    book_data = await request.get_json()
-    validation_errors = book_schema.validate(book_data, partial=True)
-    if validation_errors:
+    try:
+        book_data = book_schema.load(await request.get_json(), partial=True)
+    except ValidationError as err:
         return (
             jsonify({
                 "success": False,
                 "message": "Validation error",
-                "errors": validation_errors,
+                "errors": err.messages,
             }),
             400,
         )
@@ -73,11 +141,21 @@ async def delete_book(book_id):
     return jsonify(result), status_code
 
 @books_bp.route("/search", methods=["GET"])
+@cached_response("books", "authors", "publishers")
 async def search_books():
+    try:
+        fields = requested_fields(books_schema, BOOK_RELATIONS)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    columns = wants_columns()
+    if columns and fields is None:
+        fields = tuple(sorted(books_schema.schema.dump_fields))
     title = request.args.get("title", "")
     page = int(request.args.get("page", 1))
-    per_page = int(request.args.get("per_page", 10))
-    result, status_code = await BookService.search_by_title(title, page, per_page)
-    if result["success"] and "data" in result:
-        result["data"] = books_schema.dump(result["data"])
-    return jsonify(result), status_code
+    per_page = per_page_arg()
+    result, status_code = await BookService.search_by_title(
+        title, page, per_page, fields=fields, columns=columns
+    )
+    if columns:
+        return columnar_response(result, status_code)
+    return conditional_jsonify(result, status_code, books_schema, book_version, fields)
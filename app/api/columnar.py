@@ -0,0 +1,50 @@
+import hashlib
+from quart import Response, current_app, jsonify, request
+
+COLUMNAR_MIMETYPE = "application/vnd.columnar+json"
+
+
+def wants_columns():
+    """Whether the client asked for a columnar body.
+
+    Either with ``?format=columns`` or by preferring the columnar media
+    type over plain JSON in Accept.
+    """
+    if request.args.get("format") == "columns":
+        return True
+    best = request.accept_mimetypes.best_match(["application/json", COLUMNAR_MIMETYPE])
+    return best == COLUMNAR_MIMETYPE
+
+
+def transpose(columns, rows):
+    """``{column: [value of each row]}`` for result ``rows`` named by ``columns``."""
+    if not rows:
+        return {name: [] for name in columns}
+    return {name: list(values) for name, values in zip(columns, zip(*rows))}
+
+
+def columnar_response(result, status_code):
+    """Respond with ``result["data"]``, result rows, as one array per column.
+
+    Keys are not repeated per row, so large pages are smaller and cheaper
+    to encode than a list of objects. The ETag hashes the rows themselves,
+    and a matching If-None-Match is answered 304 before anything is encoded.
+    """
+    if not (result["success"] and "data" in result):
+        return jsonify(result), status_code
+    columns = result["columns"]
+    digest = hashlib.blake2b(
+        repr(
+            (COLUMNAR_MIMETYPE, columns, result["data"], result.get("pagination"))
+        ).encode(),
+        digest_size=16,
+    )
+    etag = digest.hexdigest()
+    if request.if_none_match.contains(etag):
+        response = Response("", status=304)
+    else:
+        result["data"] = transpose(columns, result["data"])
+        body = current_app.json.dumpb(result)
+        response = Response(body, status=status_code, mimetype=COLUMNAR_MIMETYPE)
+    response.set_etag(etag)
+    return response
@@ -0,0 +1,62 @@
+import hashlib
+from quart import Response, jsonify, request
+from app.api.fields import project
+
+
+def book_version(book, fields=None):
+    """The values a book's response is built from, limited to ``fields``."""
+    version = [book.id, book.updated_at]
+    if fields is None or "author" in fields:
+        author = book.author
+        version.append(author and (author.id, author.first_name, author.last_name))
+    if fields is None or "publisher" in fields:
+        publisher = book.publisher
+        version.append(publisher and (publisher.id, publisher.name))
+    return tuple(version)
+
+
+def owner_version(owner, fields=None):
+    """Version of an author or publisher, including its embedded book previews."""
+    version = [owner.id, owner.updated_at]
+    if fields is None or "books_count" in fields:
+        version.append(owner.books_count)
+    if fields is None or "books" in fields:
+        version.append(tuple((book.id, book.title) for book in owner.books))
+    return tuple(version)
+
+
+def make_etag(result, version, fields=None):
+    """Strong ETag over the versions of ``result["data"]`` and its pagination.
+
+    Only the values the response serializes are hashed, so a matching
+    request can be answered without dumping anything. Narrowed responses
+    hash the requested ``fields`` too, as their bodies differ.
+    """
+    data = result["data"]
+    if isinstance(data, list):
+        items = [version(item, fields) for item in data]
+    else:
+        items = version(data, fields)
+    digest = hashlib.blake2b(
+        repr((items, result.get("pagination"), fields)).encode(), digest_size=16
+    )
+    return digest.hexdigest()
+
+
+def conditional_jsonify(result, status_code, schema, version, fields=None):
+    """jsonify ``result`` with its data dumped through ``schema`` and an ETag.
+
+    Only ``fields`` are dumped when given. Answers 304 Not Modified,
+    skipping the dump, when If-None-Match matches.
+    """
+    if not (result["success"] and "data" in result):
+        return jsonify(result), status_code
+    etag = make_etag(result, version, fields)
+    if request.if_none_match.contains(etag):
+        response = Response("", status=304)
+    else:
+        result["data"] = project(schema, fields).dump(result["data"])
+        response = jsonify(result)
+        response.status_code = status_code
+    response.set_etag(etag)
+    return response
@@ -0,0 +1,76 @@
+import csv
+import datetime as dt
+import decimal
+import io
+from quart import Response, current_app, jsonify, request, stream_with_context
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _csv_value(value):
+    if isinstance(value, decimal.Decimal):
+        return format(value, "f")
+    if isinstance(value, dt.datetime):
+        # str() would separate the date and time with a space
+        return value.isoformat()
+    return value
+
+
+def ndjson_chunk(rows, dumpb):
+    """Encode a batch of rows as one JSON object per line."""
+    return b"".join([dumpb(row._asdict()) + b"\n" for row in rows])
+
+
+def csv_chunk(rows, header=False):
+    """Encode a batch of rows as CSV, preceded by the column names if ``header``."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(rows[0]._fields)
+    writer.writerows([[_csv_value(value) for value in row] for row in rows])
+    return buffer.getvalue().encode()
+
+
+def export_response(result, status_code, name):
+    """Stream ``result["data"]``, batches of rows, as NDJSON or CSV.
+
+    The format comes from ``?format=``. Each batch is written as soon as it
+    is fetched, so the response starts before the table has been read and
+    memory stays flat however large it is.
+    """
+    export_format = request.args.get("format", "ndjson")
+    if export_format not in EXPORT_FORMATS:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "message": f"Unsupported export format: {export_format}",
+                }
+            ),
+            400,
+        )
+    if not result["success"]:
+        return jsonify(result), status_code
+    batches = result["data"]
+
+    # The request context, and with it the request's session, is torn
+    # down before the body is sent; the stream gets a context of its own
+    @stream_with_context
+    async def body():
+        if export_format == "csv":
+            header = True
+            async for rows in batches:
+                yield csv_chunk(rows, header)
+                header = False
+        else:
+            dumpb = current_app.json.dumpb
+            async for rows in batches:
+                yield ndjson_chunk(rows, dumpb)
+
+    response = Response(body(), mimetype=EXPORT_FORMATS[export_format])
+    response.headers["Content-Disposition"] = (
+        f'attachment; filename="{name}.{export_format}"'
+    )
+    # A full export may take longer than RESPONSE_TIMEOUT to send
+    response.timeout = None
+    return response
@@ -0,0 +1,46 @@
+from functools import lru_cache
+from quart import request
+from app.schemas.compiled import CompiledSchema
+
+# Nested summaries of a book, only loaded and dumped when asked for
+BOOK_RELATIONS = ("author", "publisher")
+
+
+def _arg_names(name):
+    value = request.args.get(name, "")
+    return {part.strip() for part in value.split(",")} - {""}
+
+
+def requested_fields(schema, relations=()):
+    """Sorted field names to dump for this request, or None for all of them.
+
+    ``?fields=`` picks the fields. ``relations`` are nested fields left out
+    unless named in ``?include=`` or ``?fields=``; their ids are dumped
+    either way. Raises ValueError naming any unknown field or include.
+    """
+    base = schema.schema if isinstance(schema, CompiledSchema) else schema
+    include = _arg_names("include")
+    unknown = include - set(relations)
+    if unknown:
+        raise ValueError(f"Unknown includes: {', '.join(sorted(unknown))}")
+    names = _arg_names("fields")
+    if names:
+        unknown = names - base.dump_fields.keys()
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        names |= include
+    elif include == set(relations):
+        return None
+    else:
+        names = (base.dump_fields.keys() - set(relations)) | include
+    return tuple(sorted(names))
+
+
+@lru_cache(maxsize=256)
+def project(schema, fields):
+    """``schema`` narrowed to dump only ``fields``; compiled schemas stay compiled."""
+    if fields is None:
+        return schema
+    if isinstance(schema, CompiledSchema):
+        return CompiledSchema(project(schema.schema, fields), schema.native)
+    return type(schema)(many=schema.many, exclude=schema.exclude, only=fields)
@@ -0,0 +1,23 @@
+from quart import Blueprint, current_app, jsonify
+from quart_jwt_extended import jwt_required
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/cache", methods=["GET"])
+@jwt_required
+async def get_cache_metrics():
+    """Get hit/miss counters of the in-process entity and response caches"""
+    stats = {
+        "entity": current_app.entity_cache.stats(),
+        "negative": current_app.negative_cache.stats(),
+        "response": current_app.response_cache.stats(),
+    }
+    return jsonify({"success": True, "data": stats}), 200
+
+
+@metrics_bp.route("/coalescing", methods=["GET"])
+@jwt_required
+async def get_coalescing_metrics():
+    """Get how many repository reads were shared with an identical in-flight read"""
+    return jsonify({"success": True, "data": current_app.single_flight.stats()}), 200
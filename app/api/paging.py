@@ -0,0 +1,7 @@
+from quart import current_app, request
+
+
+def per_page_arg(default=10):
+    """``?per_page=`` clamped to 1..MAX_PER_PAGE; the default if not a number."""
+    per_page = request.args.get("per_page", default, type=int)
+    return min(max(per_page, 1), current_app.config["MAX_PER_PAGE"])
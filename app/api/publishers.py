@@ -1,7 +1,15 @@
-from quart import Blueprint, request, jsonify
+from quart import Blueprint, current_app, request, jsonify
 from quart_jwt_extended import jwt_required
 from app.services.publisher_service import PublisherService
+from app.services.book_service import BookService
 from app.schemas.publisher import PublisherSchema
+from app.schemas.book import BookSchema
+from app.cache import cached_response
+from app.api.export import export_response
+from app.api.paging import per_page_arg
+from app.api.fields import BOOK_RELATIONS, requested_fields
+from app.api.etag import conditional_jsonify, book_version, owner_version
+from app.schemas.compiled import compile_schema
 from marshmallow import ValidationError
 import logging
 
@@ -10,48 +18,89 @@ logger = logging.getLogger(__name__)
 
 publishers_bp = Blueprint("publishers", __name__)
 publisher_schema = PublisherSchema()
-publishers_schema = PublisherSchema(many=True)
+publishers_schema = compile_schema(PublisherSchema(many=True), native=True)
+books_schema = compile_schema(BookSchema(many=True), native=True)
 
 
 @publishers_bp.route("", methods=["GET"])
+@cached_response("publishers", "books")
 async def get_publishers():
     """Get all publishers with pagination and optional filtering by name"""
+    try:
+        fields = requested_fields(publishers_schema)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
     page = int(request.args.get("page", 1))
-    per_page = int(request.args.get("per_page", 10))
+    per_page = per_page_arg()
     name = request.args.get("name", "")
-    if name:
+    if "cursor" in request.args:
+        cursor = request.args.get("cursor")
+        result, status_code = await PublisherService.get_all_after(
+            cursor, per_page, fields=fields, name=name
+        )
+    elif name:
         result, status_code = await PublisherService.search_by_name(
-            name, page, per_page
+            name, page, per_page, fields=fields
         )
     else:
-        result, status_code = await PublisherService.get_all(page, per_page)
-    if result["success"] and "data" in result:
-        result["data"] = publishers_schema.dump(result["data"])
-    return jsonify(result), status_code
+        result, status_code = await PublisherService.get_all(
+            page, per_page, fields=fields
+        )
+    return conditional_jsonify(
+        result, status_code, publishers_schema, owner_version, fields
+    )
+
+
+@publishers_bp.route("/export", methods=["GET"])
+async def export_publishers():
+    """Stream every publisher as NDJSON or CSV"""
+    batch_size = current_app.config["EXPORT_BATCH_SIZE"]
+    result, status_code = await PublisherService.export(batch_size)
+    return export_response(result, status_code, "publishers")
 
 
 @publishers_bp.route("/<int:publisher_id>", methods=["GET"])
 async def get_publisher(publisher_id):
     """Get a specific publisher by ID"""
+    try:
+        fields = requested_fields(publisher_schema)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
     result, status_code = await PublisherService.get_by_id(publisher_id)
-    if result["success"]:
-        result["data"] = publisher_schema.dump(result["data"])
-    return jsonify(result), status_code
+    return conditional_jsonify(
+        result, status_code, publisher_schema, owner_version, fields
+    )
+
+
+@publishers_bp.route("/<int:publisher_id>/books", methods=["GET"])
+@cached_response("books", "authors", "publishers")
+async def get_publisher_books(publisher_id):
+    """Get the books of a publisher with pagination"""
+    try:
+        fields = requested_fields(books_schema, BOOK_RELATIONS)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+    page = int(request.args.get("page", 1))
+    per_page = per_page_arg()
+    result, status_code = await BookService.get_by_publisher(
+        publisher_id, page, per_page, fields=fields
+    )
+    return conditional_jsonify(result, status_code, books_schema, book_version, fields)
 
 
 @publishers_bp.route("/", methods=["POST"])
 @jwt_required
 async def create_publisher():
     """Create a new publisher"""
-    publisher_data = await request.get_json()
-    validation_errors = publisher_schema.validate(publisher_data)
-    if validation_errors:
+    try:
+        publisher_data = publisher_schema.load(await request.get_json())
+    except ValidationError as err:
         return (
             jsonify(
                 {
                     "success": False,
                     "message": "Validation error",
-                    "errors": validation_errors,
+                    "errors": err.messages,
                 }
             ),
             400,
@@ -66,15 +115,15 @@ async def create_publisher():
 @jwt_required
 async def update_publisher(publisher_id):
     """Update an existing publisher"""
-    publisher_data = await request.get_json()
-    validation_errors = publisher_schema.validate(publisher_data, partial=True)
-    if validation_errors:
+    try:
+        publisher_data = publisher_schema.load(await request.get_json(), partial=True)
+    except ValidationError as err:
         return (
             jsonify(
                 {
                     "success": False,
                     "message": "Validation error",
-                    "errors": validation_errors,
+                    "errors": err.messages,
                 }
             ),
             400,
@@ -96,14 +145,19 @@ async def delete_publisher(publisher_id):
 
 
 @publishers_bp.route("/search", methods=["GET"])
+@cached_response("publishers", "books")
 async def search_publishers():
     """Search publishers by name with pagination"""
+    try:
+        fields = requested_fields(publishers_schema)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
     name = request.args.get("name", "")
     page = int(request.args.get("page", 1))
-    per_page = int(request.args.get("per_page", 10))
+    per_page = per_page_arg()
     result, status_code = await PublisherService.search_by_name(
-        name, page, per_page
+        name, page, per_page, fields=fields
+    )
+    return conditional_jsonify(
+        result, status_code, publishers_schema, owner_version, fields
     )
-    if result["success"] and "data" in result:
-        result["data"] = publishers_schema.dump(result["data"])
-    return jsonify(result), status_code
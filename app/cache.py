@@ -0,0 +1,245 @@
+import time
+from collections import OrderedDict
+from functools import wraps
+from quart import Response, current_app, g, make_response, request
+
+
+class EntityCache:
+    """Bounded LRU cache of detached entities with a per-entry TTL.
+
+    Entries may declare the keys they depend on, e.g. a book depends on
+    ``("author", author_id)`` because it embeds the author's summary, so
+    ``invalidate`` can drop dependents along with the entry itself.
+    """
+
+    def __init__(self, maxsize=1024, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None or entry[1] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, key, value, depends_on=()):
+        if self.maxsize <= 0:
+            return
+        expires = time.monotonic() + self.ttl
+        self._entries[key] = (value, expires, frozenset(depends_on))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def discard(self, *keys):
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def invalidate(self, *keys):
+        """Drop ``keys`` and every entry that depends on one of them."""
+        stale = set(keys)
+        for key, (_, _, depends_on) in self._entries.items():
+            if depends_on & stale:
+                stale.add(key)
+        self.discard(*stale)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+
+class ResponseCache:
+    """Serialized responses, bounded by the total size of their bodies.
+
+    Keys carry the generation of every table a response reads; bumping a
+    generation makes the older entries unreachable and LRU eviction
+    reclaims them, so writes never have to enumerate keys.
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024, ttl=30):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._generations = {}
+
+    def bump(self, *tables):
+        for table in tables:
+            self._generations[table] = self._generations.get(table, 0) + 1
+
+    def key(self, path, args, tables, accept=""):
+        generations = tuple(self._generations.get(table, 0) for table in tables)
+        return path, tuple(sorted(args.items(multi=True))), accept, generations
+
+    def get(self, key):
+        """Return the cached ``(body, etag, mimetype)`` for ``key``, or None."""
+        entry = self._entries.get(key)
+        if entry is None or entry[3] < time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0], entry[1], entry[2]
+
+    def set(self, key, body, etag, mimetype="application/json"):
+        if len(body) > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = (body, etag, mimetype, time.monotonic() + self.ttl)
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, (evicted, _, _, _) = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[0])
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "size": self.size,
+            "max_bytes": self.max_bytes,
+        }
+
+
+def cached_response(*tables):
+    """Serve a GET view's 200 responses from the response cache.
+
+    ``tables`` are the tables the response reads, including those of
+    embedded relations; a write to any of them bumps its generation.
+    Responses are cached per Accept header, as views may negotiate.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            if not current_app.config["RESPONSE_CACHE_ENABLED"]:
+                return await view(*args, **kwargs)
+            cache = current_app.response_cache
+            accept = request.headers.get("Accept", "")
+            key = cache.key(request.path, request.args, tables, accept)
+            entry = cache.get(key)
+            if entry is None:
+                response = await make_response(await view(*args, **kwargs))
+                if response.status_code == 200:
+                    etag, _ = response.get_etag()
+                    body = await response.get_data()
+                    cache.set(key, body, etag, response.mimetype)
+                return response
+            body, etag, mimetype = entry
+            if request.if_none_match.contains(etag):
+                response = Response("", status=304)
+            else:
+                response = Response(body, mimetype=mimetype)
+            response.set_etag(etag)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def lookup_entity(key):
+    """Return ``(hit, entity)``; a hit with None is a cached "not found".
+
+    The negative cache is probed first, so a cached "not found" is counted
+    as a negative hit only, not as an entity cache miss.
+    """
+    if current_app.negative_cache.get(key) is not None:
+        return True, None
+    entity = current_app.entity_cache.get(key)
+    return entity is not None, entity
+
+
+def cache_entity(session, key, entity, related=(), depends_on=()):
+    """Detach ``entity`` and its loaded ``related`` objects and cache it.
+
+    Cached entities are shared between requests, so they must not stay in
+    a request session where a rollback would expire them. They are also
+    read-only: repositories write through UPDATE and DELETE statements by
+    id and return new instances, never modifying a cached one.
+    """
+    for instance in (entity, *related):
+        if instance is not None and instance in session:
+            session.expunge(instance)
+    current_app.entity_cache.set(key, entity, depends_on)
+
+
+def cache_missing(key):
+    """Remember for NEGATIVE_CACHE_TTL seconds that ``key`` does not exist."""
+    current_app.negative_cache.set(key, True)
+
+
+def _drop(dependents, keys):
+    for cache in (current_app.entity_cache, current_app.negative_cache):
+        if dependents:
+            cache.invalidate(*keys)
+        else:
+            cache.discard(*keys)
+
+
+def invalidate(*keys):
+    """Drop cached entities and their dependents, again after the commit."""
+    _drop(True, keys)
+    g.setdefault("stale_entities", []).append((True, keys))
+
+
+def discard(*keys):
+    """Drop cached entities only, again after the commit.
+
+    Also clears "not found" entries, so a created row is visible at once.
+    """
+    _drop(False, keys)
+    g.setdefault("stale_entities", []).append((False, keys))
+
+
+def bump_generation(*tables):
+    """Invalidate cached responses reading ``tables``, again after the commit."""
+    current_app.response_cache.bump(*tables)
+    g.setdefault("stale_tables", []).extend(tables)
+
+
+def replay_invalidations():
+    """Repeat this request's invalidations once its transaction has committed.
+
+    Concurrent requests may have cached rows read before the commit;
+    repeating the invalidation clears them.
+    """
+    for dependents, keys in g.pop("stale_entities", []):
+        _drop(dependents, keys)
+    stale_tables = g.pop("stale_tables", None)
+    if stale_tables:
+        current_app.response_cache.bump(*set(stale_tables))
+
+
+def drop_invalidations():
+    """Forget this request's queued invalidations, as its writes rolled back."""
+    g.pop("stale_entities", None)
+    g.pop("stale_tables", None)
@@ -13,6 +13,35 @@ class Config:
     )
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+    # Books embedded in author/publisher responses; the rest are paginated
+    # under /api/authors/<id>/books and /api/publishers/<id>/books
+    NESTED_BOOKS_LIMIT = int(os.getenv("NESTED_BOOKS_LIMIT", 10))
+    # Largest page a list route serves; ?per_page= is clamped to 1..this
+    MAX_PER_PAGE = int(os.getenv("MAX_PER_PAGE", 100))
+    # werkzeug hash method with its cost, e.g. "pbkdf2:sha256:600000"; older
+    # hashes are upgraded on the next successful login
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    # Threads hashing and verifying passwords; 0 runs them on the event loop
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 4))
+    # In-process cache for get_by_id lookups; a size of 0 disables it. The
+    # TTL bounds staleness from writes made by other processes.
+    ENTITY_CACHE_SIZE = int(os.getenv("ENTITY_CACHE_SIZE", 1024))
+    ENTITY_CACHE_TTL = float(os.getenv("ENTITY_CACHE_TTL", 30))
+    # Ids known not to exist, kept apart so misses cannot evict real entries
+    NEGATIVE_CACHE_SIZE = int(os.getenv("NEGATIVE_CACHE_SIZE", 4096))
+    NEGATIVE_CACHE_TTL = float(os.getenv("NEGATIVE_CACHE_TTL", 5))
+    # Serialized list and search responses, bounded by total body size;
+    # like the entity cache, the TTL bounds staleness across processes
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "1") == "1"
+    RESPONSE_CACHE_MAX_BYTES = int(
+        os.getenv("RESPONSE_CACHE_MAX_BYTES", 16 * 1024 * 1024)
+    )
+    RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", 30))
+    # Rows fetched per round trip by the streaming /export endpoints
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+    # Books accepted by one POST /api/books/bulk, and rows per INSERT batch
+    BULK_MAX_BOOKS = int(os.getenv("BULK_MAX_BOOKS", 10000))
+    BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", 1000))
 
 
 class DevelopmentConfig(Config):
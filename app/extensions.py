@@ -1,5 +1,8 @@
+from quart import current_app, g
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from app.cache import drop_invalidations, replay_invalidations
 
 async_db = None
 async_engine = None
@@ -9,3 +12,46 @@ async_session = None
 # async_engine = create_async_engine(DB_URL)
 # async_session = sessionmaker(async_engine, expire_on_commit=False, class_=AsyncSession)
 # async_db = ... (define your async db interface or use SQLAlchemy's async API directly)
+
+
+def get_session():
+    """Return the AsyncSession shared by every repository call in this request.
+
+    Repositories only flush; the transaction is committed once by
+    ``commit_session`` when the request finishes successfully.
+    """
+    if "db_session" not in g:
+        g.db_session = current_app.async_session()
+    return g.db_session
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement_writes(orm_execute_state):
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush_writes(session, flush_context):
+    # Lets reads that are shared between requests skip this session's data
+    session.info["has_writes"] = True
+
+
+async def commit_session(response):
+    session = g.get("db_session")
+    if response.status_code < 400:
+        if session is not None:
+            await session.commit()
+        replay_invalidations()
+    else:
+        if session is not None:
+            await session.rollback()
+        drop_invalidations()
+    return response
+
+
+async def close_session(exc):
+    # A request that raised may not reach commit_session; closing rolls it back
+    session = g.pop("db_session", None)
+    if session is not None:
+        await session.close()
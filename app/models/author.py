@@ -1,15 +1,37 @@
+import unicodedata
 from app.models import Base
-from sqlalchemy import Column, Integer, String, Text, Date, DateTime
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    Text,
+    Date,
+    DateTime,
+    Index,
+    DDL,
+    event,
+    column,
+    table,
+)
 from sqlalchemy.orm import relationship
 from datetime import datetime, UTC
 
 
+def normalize_name(name):
+    """Lowercase, strip accents and collapse whitespace for name matching."""
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
 class Author(Base):
     __tablename__ = "authors"
+    __table_args__ = (Index("ix_authors_last_name_id", "last_name", "id"),)
 
     id = Column(Integer, primary_key=True)
     first_name = Column(String(50), nullable=False)
     last_name = Column(String(50), nullable=False)
+    search_name = Column(String(101), index=True)
     biography = Column(Text)
     birth_date = Column(Date)
     created_at = Column(DateTime, default=lambda: datetime.now(UTC))
@@ -22,3 +44,53 @@ class Author(Base):
 
     def __repr__(self):
         return f"<Author {self.first_name} {self.last_name}>"
+
+
+@event.listens_for(Author, "before_insert")
+@event.listens_for(Author, "before_update")
+def _set_search_name(mapper, connection, target):
+    target.search_name = normalize_name(f"{target.first_name} {target.last_name}")
+
+
+# FTS5 index over the normalized full name so any word of the name can be
+# prefix-matched through an index; kept in sync by triggers.
+authors_fts = table("authors_fts", column("rowid"), column("authors_fts"))
+
+authors_fts_ddl = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS authors_fts USING fts5(
+        search_name, content='authors', content_rowid='id', prefix='1 2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS authors_fts_ai AFTER INSERT ON authors BEGIN
+        INSERT INTO authors_fts(rowid, search_name)
+        VALUES (new.id, new.search_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS authors_fts_ad AFTER DELETE ON authors BEGIN
+        INSERT INTO authors_fts(authors_fts, rowid, search_name)
+        VALUES ('delete', old.id, old.search_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS authors_fts_au AFTER UPDATE OF search_name
+    ON authors BEGIN
+        INSERT INTO authors_fts(authors_fts, rowid, search_name)
+        VALUES ('delete', old.id, old.search_name);
+        INSERT INTO authors_fts(rowid, search_name)
+        VALUES (new.id, new.search_name);
+    END
+    """,
+]
+
+for _statement in authors_fts_ddl:
+    event.listen(
+        Author.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Author.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS authors_fts").execute_if(dialect="sqlite"),
+)
@@ -8,6 +8,11 @@ from sqlalchemy import (
     Text,
     ForeignKey,
     DateTime,
+    Index,
+    DDL,
+    event,
+    column,
+    table,
 )
 from sqlalchemy.orm import relationship
 from datetime import UTC, datetime
@@ -15,6 +20,7 @@ from datetime import UTC, datetime
 
 class Book(Base):
     __tablename__ = "books"
+    __table_args__ = (Index("ix_books_title_id", "title", "id"),)
 
     id = Column(Integer, primary_key=True)
     title = Column(String(200), nullable=False)
@@ -25,10 +31,16 @@ class Book(Base):
 
     # Foreign keys
     author_id = Column(
-        Integer, ForeignKey("authors.id", ondelete="SET NULL"), nullable=True
+        Integer,
+        ForeignKey("authors.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
     )
     publisher_id = Column(
-        Integer, ForeignKey("publishers.id", ondelete="SET NULL"), nullable=True
+        Integer,
+        ForeignKey("publishers.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
     )
 
     # Relationships
@@ -42,3 +54,48 @@ class Book(Base):
 
     def __repr__(self):
         return f"Book {self.title}"
+
+
+# External-content FTS5 index over title and description, kept in sync with
+# the books table by triggers so the ORM does not need to know about it.
+books_fts = table("books_fts", column("rowid"), column("books_fts"))
+
+books_fts_ddl = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+        title, description, content='books', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+        INSERT INTO books_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_fts_au AFTER UPDATE OF title, description
+    ON books BEGIN
+        INSERT INTO books_fts(books_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO books_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+for _statement in books_fts_ddl:
+    event.listen(
+        Book.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Book.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS books_fts").execute_if(dialect="sqlite"),
+)
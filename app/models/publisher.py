@@ -1,11 +1,12 @@
 from app.models import Base
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import UTC, datetime
 
 
 class Publisher(Base):
     __tablename__ = "publishers"
+    __table_args__ = (Index("ix_publishers_name_id", "name", "id"),)
 
     id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False)
@@ -0,0 +1,65 @@
+from sqlalchemy import bindparam, inspect, select, text, update
+from sqlalchemy.schema import CreateIndex
+from app.models import Base
+from app.models.author import Author, authors_fts_ddl, normalize_name
+from app.models.book import books_fts_ddl
+
+
+def _add_search_name(connection):
+    columns = {column["name"] for column in inspect(connection).get_columns("authors")}
+    if "search_name" not in columns:
+        connection.execute(
+            text("ALTER TABLE authors ADD COLUMN search_name VARCHAR(101)")
+        )
+
+
+def _backfill_search_name(connection):
+    authors = Author.__table__
+    rows = connection.execute(
+        select(
+            authors.c.id,
+            authors.c.first_name,
+            authors.c.last_name,
+            authors.c.search_name,
+        )
+    ).all()
+    stale = []
+    for row in rows:
+        name = normalize_name(f"{row.first_name} {row.last_name}")
+        if name != row.search_name:
+            stale.append({"author_id": row.id, "name": name})
+    if stale:
+        stmt = (
+            update(authors)
+            .where(authors.c.id == bindparam("author_id"))
+            .values(search_name=bindparam("name"))
+        )
+        connection.execute(stmt, stale)
+
+
+def _upgrade(connection):
+    # Tables missing altogether are created with their indexes and FTS tables
+    Base.metadata.create_all(connection)
+    _add_search_name(connection)
+    _backfill_search_name(connection)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            connection.execute(CreateIndex(index, if_not_exists=True))
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in (*books_fts_ddl, *authors_fts_ddl):
+        connection.execute(text(statement))
+    # Index the rows written before the triggers existed
+    connection.execute(text("INSERT INTO books_fts(books_fts) VALUES ('rebuild')"))
+    connection.execute(text("INSERT INTO authors_fts(authors_fts) VALUES ('rebuild')"))
+
+
+async def upgrade_database(engine):
+    """Bring an existing database up to the current models, idempotently.
+
+    ``create_all`` only creates missing tables, so this also adds the
+    author search key column and backfills it, creates any missing index,
+    and creates and rebuilds the FTS5 search tables and their triggers.
+    """
+    async with engine.begin() as connection:
+        await connection.run_sync(_upgrade)
@@ -1,3 +1,4 @@
+from quart import current_app
 from app.models import Base
 from sqlalchemy import Column, Integer, String, Boolean, DateTime
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -15,10 +16,14 @@ class User(Base):
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
-    def __init__(self, username, email, password):
+    def __init__(self, username, email, password=None, password_hash=None):
         self.username = username
         self.email = email
-        self.password_hash = generate_password_hash(password)
+        # Async callers pass a hash from app.passwords to keep the loop free
+        if password_hash is None:
+            method = current_app.config["PASSWORD_HASH_METHOD"]
+            password_hash = generate_password_hash(password, method)
+        self.password_hash = password_hash
 
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
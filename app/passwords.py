@@ -0,0 +1,61 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from quart import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class PasswordHasher:
+    """Hash and verify passwords on a bounded thread pool.
+
+    ``method`` is a werkzeug method string carrying its cost parameters,
+    e.g. ``"scrypt:32768:8:1"`` or ``"pbkdf2:sha256:600000"``.
+
+    scrypt and pbkdf2 take tens of milliseconds of CPU; hashlib releases
+    the GIL while computing them, so threads keep the event loop free and
+    ``max_workers`` caps how many run at once. With ``max_workers=0`` the
+    work runs inline on the event loop.
+    """
+
+    def __init__(self, method="scrypt", max_workers=4):
+        self.method = method
+        self._hash_prefix = None
+        self._executor = None
+        if max_workers > 0:
+            self._executor = ThreadPoolExecutor(
+                max_workers, thread_name_prefix="password-hash"
+            )
+
+    async def _run(self, func, *args):
+        if self._executor is None:
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def hash(self, password):
+        return await self._run(generate_password_hash, password, self.method)
+
+    async def verify(self, password_hash, password):
+        return await self._run(check_password_hash, password_hash, password)
+
+    async def needs_rehash(self, password_hash):
+        """Whether ``password_hash`` was made with other method or cost parameters."""
+        if self._hash_prefix is None:
+            # werkzeug fills in default parameters, so read them off a real hash
+            self._hash_prefix = (await self.hash("")).split("$", 1)[0]
+        return password_hash.split("$", 1)[0] != self._hash_prefix
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+
+async def hash_password(password):
+    return await current_app.password_hasher.hash(password)
+
+
+async def verify_password(password_hash, password):
+    return await current_app.password_hasher.verify(password_hash, password)
+
+
+async def password_needs_rehash(password_hash):
+    return await current_app.password_hasher.needs_rehash(password_hash)
@@ -1,88 +1,186 @@
-from quart import current_app
+from app.extensions import get_session
+from sqlalchemy import delete, false, insert, update
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
-from app.models.author import Author
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm import defer
+from app.repositories.pagination import paginate, seek, stream_batches
+from app.repositories.singleflight import coalesced
+from app.repositories.previews import load_book_previews
+from app.repositories.projection import load_fields, wants_previews
+from app.repositories.fts import fts_query
+from app.cache import cache_entity, cache_missing, lookup_entity
+from app.models.author import Author, authors_fts, normalize_name
+from app.models.book import Book
+
+# The search key is never dumped
+_list_options = (defer(Author.search_name, raiseload=True),)
+
+
+def _list_load(fields, *required):
+    """Loader options for a list query dumping ``fields``, or every list field."""
+    if fields is None:
+        return _list_options
+    return load_fields(Author, fields, required=required)
+
+
+def _match_name(stmt, name):
+    """Restrict ``stmt`` to authors whose full name matches ``name``."""
+    query = fts_query(normalize_name(name))
+    if query is None:
+        return stmt.where(false())
+    return stmt.join(authors_fts, authors_fts.c.rowid == Author.id).where(
+        authors_fts.c.authors_fts.op("MATCH")(query)
+    )
+
+
+# Exports carry the author table's own columns; relations are exported by id
+_export_columns = (
+    Author.id,
+    Author.first_name,
+    Author.last_name,
+    Author.biography,
+    Author.birth_date,
+    Author.created_at,
+    Author.updated_at,
+)
 
 
 class AuthorRepository:
     @staticmethod
-    async def get_all(page=1, per_page=10):
+    @coalesced
+    async def get_all(page=1, per_page=10, fields=None):
+        try:
+            session = get_session()
+            stmt = select(Author).options(*_list_load(fields)).order_by(Author.id)
+            pagination = await paginate(session, stmt, page, per_page)
+            if wants_previews(fields):
+                await load_book_previews(session, pagination.items, Book.author_id)
+            return pagination
+        except Exception as e:
+            raise Exception(f"Error fetching authors: {str(e)}")
+
+    @staticmethod
+    @coalesced
+    async def get_all_after(after=None, per_page=10, fields=None, name=None):
+        """Seek the next page by last name, among authors matching ``name`` if given."""
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                stmt = select(Author).options(selectinload(Author.books))
-                result = await session.execute(stmt)
-                authors = result.scalars().all()
-                start = (page - 1) * per_page
-                end = start + per_page
-                return authors[start:end]
+            session = get_session()
+            stmt = select(Author).options(*_list_load(fields, "last_name"))
+            if name:
+                stmt = _match_name(stmt, name)
+            key_columns = (Author.last_name, Author.id)
+            pagination = await seek(session, stmt, key_columns, after, per_page)
+            if wants_previews(fields):
+                await load_book_previews(session, pagination.items, Book.author_id)
+            return pagination
         except Exception as e:
             raise Exception(f"Error fetching authors: {str(e)}")
 
     @staticmethod
+    async def stream_all(batch_size=1000):
+        """Yield the export columns of every author, by id, in batches of rows."""
+        try:
+            session = get_session()
+            stmt = select(*_export_columns).order_by(Author.id)
+            async for rows in stream_batches(session, stmt, batch_size):
+                yield rows
+        except Exception as e:
+            raise Exception(f"Error exporting authors: {str(e)}")
+
+    @staticmethod
+    @coalesced
     async def get_by_id(author_id):
+        """Fetch an author through the entity cache."""
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                stmt = (
-                    select(Author)
-                    .options(selectinload(Author.books))
-                    .where(Author.id == author_id)
+            key = ("author", author_id)
+            hit, author = lookup_entity(key)
+            if hit:
+                return author
+            session = get_session()
+            stmt = select(Author).where(Author.id == author_id)
+            result = await session.execute(stmt)
+            author = result.scalar_one_or_none()
+            if author is not None:
+                await load_book_previews(session, [author], Book.author_id)
+                cache_entity(
+                    session,
+                    key,
+                    author,
+                    related=author.books,
+                    depends_on=[("book", book.id) for book in author.books],
                 )
-                result = await session.execute(stmt)
-                return result.scalar_one_or_none()
+            else:
+                cache_missing(key)
+            return author
         except Exception as e:
             raise Exception(f"Error fetching author by id: {str(e)}")
 
     @staticmethod
-    async def create(author):
+    async def create(values):
+        """Insert an author and return it as stored, via RETURNING."""
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                session.add(author)
-                await session.commit()
-                return author
+            session = get_session()
+            # The mapper events do not run for INSERT statements
+            name = f"{values.get('first_name')} {values.get('last_name')}"
+            stmt = (
+                insert(Author)
+                .values(**values, search_name=normalize_name(name))
+                .returning(Author)
+            )
+            author = await session.scalar(stmt)
+            # A new author has no books yet, so no preview query is needed
+            set_committed_value(author, "books", [])
+            author.books_count = 0
+            return author
         except Exception as e:
             raise Exception(f"Error creating author: {str(e)}")
 
     @staticmethod
-    async def update(author):
+    async def update(author, values):
+        """Update an author via RETURNING and return the stored row."""
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                await session.commit()
-                return author
+            session = get_session()
+            if "first_name" in values or "last_name" in values:
+                # The mapper events do not run for bulk UPDATE statements
+                first_name = values.get("first_name", author.first_name)
+                last_name = values.get("last_name", author.last_name)
+                values = {
+                    **values,
+                    "search_name": normalize_name(f"{first_name} {last_name}"),
+                }
+            stmt = (
+                update(Author)
+                .where(Author.id == author.id)
+                .values(**values)
+                .returning(Author)
+            )
+            updated = await session.scalar(stmt)
+            # Books are not touched, so the previews loaded with it stay valid
+            set_committed_value(updated, "books", list(author.books))
+            updated.books_count = author.books_count
+            return updated
         except Exception as e:
             raise Exception(f"Error updating author: {str(e)}")
 
     @staticmethod
     async def delete(author):
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                await session.delete(author)
-                await session.commit()
-                return True
+            session = get_session()
+            await session.execute(delete(Author).where(Author.id == author.id))
+            return True
         except Exception as e:
             raise Exception(f"Error deleting author: {str(e)}")
 
     @staticmethod
-    async def search_by_name(name, page=1, per_page=10):
+    @coalesced
+    async def search_by_name(name, page=1, per_page=10, fields=None):
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                stmt = (
-                    select(Author)
-                    .options(selectinload(Author.books))
-                    .where(
-                        (Author.first_name.ilike(f"%{name}%"))
-                        | (Author.last_name.ilike(f"%{name}%"))
-                    )
-                )
-                result = await session.execute(stmt)
-                authors = result.scalars().all()
-                start = (page - 1) * per_page
-                end = start + per_page
-                return authors[start:end]
+            session = get_session()
+            stmt = _match_name(select(Author).options(*_list_load(fields)), name)
+            stmt = stmt.order_by(Author.search_name, Author.id)
+            pagination = await paginate(session, stmt, page, per_page)
+            if wants_previews(fields):
+                await load_book_previews(session, pagination.items, Book.author_id)
+            return pagination
         except Exception as e:
             raise Exception(f"Error searching authors: {str(e)}")
@@ -1,141 +1,337 @@
-from app.extensions import async_db as db
-from app.models.book import Book
+from app.models.author import Author
+from app.models.book import Book, books_fts
+from app.models.publisher import Publisher
+from sqlalchemy import delete, exists, false, insert, literal, literal_column, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload
-from quart import current_app
+from app.extensions import get_session
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
+from app.repositories.pagination import paginate, seek, stream_batches
+from app.repositories.singleflight import coalesced
+from app.repositories.fts import fts_query
+from app.repositories.projection import load_fields
+from app.cache import cache_entity, cache_missing, lookup_entity
+
+# Nested author/publisher rows are only dumped through their summary schemas
+_summaries = {
+    "author": selectinload(Book.author).load_only(
+        Author.id, Author.first_name, Author.last_name
+    ),
+    "publisher": selectinload(Book.publisher).load_only(Publisher.id, Publisher.name),
+}
+_summary_options = tuple(_summaries.values())
+
+
+def _list_load(fields, *required):
+    """Loader options for a list query dumping ``fields``, or every list field."""
+    if fields is None:
+        return _summary_options
+    return load_fields(Book, fields, _summaries, required)
+
+
+# Summary columns of each relation, flattened into columnar results
+_summary_columns = {
+    "author": (Author, (Author.id, Author.first_name, Author.last_name)),
+    "publisher": (Publisher, (Publisher.id, Publisher.name)),
+}
+
+
+def _list_select(fields, columns=False, *required):
+    """SELECT for a list query: books to dump, or with ``columns`` plain rows.
+
+    Rows skip ORM hydration entirely. They have one column per field in
+    ``fields``, with included relations outer-joined and flattened into
+    columns named like ``author.first_name``.
+    """
+    if not columns:
+        return select(Book).options(*_list_load(fields, *required))
+    names = [name for name in fields if name not in _summary_columns]
+    names += [name for name in required if name not in names]
+    selected = [getattr(Book, name).label(name) for name in names]
+    joins = []
+    for relation, (model, summary) in _summary_columns.items():
+        if relation in fields:
+            selected += [column.label(f"{relation}.{column.key}") for column in summary]
+            joins.append((model, getattr(Book, relation)))
+    stmt = select(*selected).select_from(Book)
+    for model, relationship in joins:
+        stmt = stmt.outerjoin(model, relationship)
+    return stmt
+
+
+def _match_title(stmt, title):
+    """Restrict ``stmt`` to books whose title or description matches ``title``."""
+    query = fts_query(title)
+    if query is None:
+        return stmt.where(false())
+    return stmt.join(books_fts, books_fts.c.rowid == Book.id).where(
+        books_fts.c.books_fts.op("MATCH")(query)
+    )
+
+
+# Exports carry the book table's own columns; relations are exported by id
+_export_columns = (
+    Book.id,
+    Book.title,
+    Book.isbn,
+    Book.publication_date,
+    Book.price,
+    Book.description,
+    Book.author_id,
+    Book.publisher_id,
+    Book.created_at,
+    Book.updated_at,
+)
 
 
 class BookRepository:
     @staticmethod
-    async def get_all(page=1, per_page=10):
+    @coalesced
+    async def get_all(page=1, per_page=10, fields=None, columns=False):
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                stmt = select(Book).options(
-                    selectinload(Book.author), selectinload(Book.publisher)
-                )
-                result = await session.execute(stmt)
-                books = result.scalars().all()
-                # Manual pagination (since paginate is not available in async)
-                start = (page - 1) * per_page
-                end = start + per_page
-                return books[start:end]
+            session = get_session()
+            stmt = _list_select(fields, columns).order_by(Book.id)
+            return await paginate(session, stmt, page, per_page, rows=columns)
         except Exception as e:
             raise Exception(f"Error fetching books: {str(e)}")
 
     @staticmethod
+    @coalesced
+    async def get_all_after(
+        after=None, per_page=10, fields=None, columns=False, title=None
+    ):
+        """Seek the next page by title, optionally among books matching ``title``."""
+        try:
+            session = get_session()
+            stmt = _list_select(fields, columns, "title", "id")
+            if title:
+                stmt = _match_title(stmt, title)
+            key_columns = (Book.title, Book.id)
+            return await seek(session, stmt, key_columns, after, per_page, rows=columns)
+        except Exception as e:
+            raise Exception(f"Error fetching books: {str(e)}")
+
+    @staticmethod
+    async def stream_all(batch_size=1000):
+        """Yield the export columns of every book, by id, in batches of rows."""
+        try:
+            session = get_session()
+            stmt = select(*_export_columns).order_by(Book.id)
+            async for rows in stream_batches(session, stmt, batch_size):
+                yield rows
+        except Exception as e:
+            raise Exception(f"Error exporting books: {str(e)}")
+
+    @staticmethod
+    @coalesced
     async def get_by_id(book_id):
+        """Fetch a book through the entity cache."""
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                stmt = (
-                    select(Book)
-                    .options(selectinload(Book.author), selectinload(Book.publisher))
-                    .where(Book.id == book_id)
+            key = ("book", book_id)
+            hit, book = lookup_entity(key)
+            if hit:
+                return book
+            session = get_session()
+            stmt = select(Book).options(*_summary_options).where(Book.id == book_id)
+            result = await session.execute(stmt)
+            book = result.scalar_one_or_none()
+            if book is not None:
+                cache_entity(
+                    session,
+                    key,
+                    book,
+                    related=(book.author, book.publisher),
+                    depends_on=[
+                        ("author", book.author_id),
+                        ("publisher", book.publisher_id),
+                    ],
                 )
-                result = await session.execute(stmt)
-                return result.scalar_one_or_none()
+            else:
+                cache_missing(key)
+            return book
         except Exception as e:
             raise Exception(f"Error fetching book by id: {str(e)}")
 
     @staticmethod
     async def get_by_isbn(isbn):
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                stmt = (
-                    select(Book)
-                    .options(selectinload(Book.author), selectinload(Book.publisher))
-                    .where(Book.isbn == isbn)
-                )
-                result = await session.execute(stmt)
-                return result.scalar_one_or_none()
+            session = get_session()
+            stmt = (
+                select(Book)
+                .options(selectinload(Book.author), selectinload(Book.publisher))
+                .where(Book.isbn == isbn)
+            )
+            result = await session.execute(stmt)
+            return result.scalar_one_or_none()
         except Exception as e:
             raise Exception(f"Error fetching book by isbn: {str(e)}")
 
     @staticmethod
-    async def create(book):
+    async def check_references(author_id=None, publisher_id=None, isbn=None):
+        """Resolve author and publisher existence and ISBN use in one query.
+
+        Returns a row with ``author_exists``, ``publisher_exists`` and
+        ``isbn_taken``; a check whose argument is None is skipped and reads None.
+        """
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                session.add(book)
-                await session.commit()
-                return book
+            session = get_session()
+            skipped = literal(None)
+            stmt = select(
+                (
+                    skipped
+                    if author_id is None
+                    else exists().where(Author.id == author_id)
+                ).label("author_exists"),
+                (
+                    skipped
+                    if publisher_id is None
+                    else exists().where(Publisher.id == publisher_id)
+                ).label("publisher_exists"),
+                (skipped if isbn is None else exists().where(Book.isbn == isbn)).label(
+                    "isbn_taken"
+                ),
+            )
+            result = await session.execute(stmt)
+            return result.one()
+        except Exception as e:
+            raise Exception(f"Error checking book references: {str(e)}")
+
+    @staticmethod
+    async def find_references(author_ids, publisher_ids, isbns, batch_size=1000):
+        """Resolve many author and publisher ids and ISBNs with IN queries.
+
+        Returns the sets of ``author_ids`` and ``publisher_ids`` that exist and
+        of ``isbns`` already taken. Each IN list holds at most ``batch_size``
+        values, keeping statements within SQLite's parameter limit.
+        """
+        try:
+            session = get_session()
+            found = []
+            for column, values in (
+                (Author.id, author_ids),
+                (Publisher.id, publisher_ids),
+                (Book.isbn, isbns),
+            ):
+                values = list(values)
+                hits = set()
+                for start in range(0, len(values), batch_size):
+                    chunk = values[start : start + batch_size]
+                    hits.update(
+                        await session.scalars(select(column).where(column.in_(chunk)))
+                    )
+                found.append(hits)
+            return tuple(found)
+        except Exception as e:
+            raise Exception(f"Error checking book references: {str(e)}")
+
+    @staticmethod
+    async def create_many(rows, batch_size=1000):
+        """Insert books with one executemany per ``batch_size`` rows.
+
+        Returns the new ids in the order of ``rows``. Books are not loaded
+        back, so no entities are built for them.
+        """
+        try:
+            session = get_session()
+            # Asking SQLAlchemy to keep RETURNING in parameter order would send
+            # one INSERT per row, as the table has no client-side sentinel.
+            # SQLite numbers rows in insertion order, so sorting the ids
+            # restores the order of ``rows`` instead.
+            stmt = insert(Book).returning(Book.id)
+            ids = []
+            for start in range(0, len(rows), batch_size):
+                result = await session.execute(stmt, rows[start : start + batch_size])
+                ids.extend(sorted(result.scalars()))
+            return ids
+        except Exception as e:
+            raise Exception(f"Error creating books: {str(e)}")
+
+    @staticmethod
+    async def create(values):
+        """Insert a book and return it, with its author and publisher, via RETURNING."""
+        try:
+            session = get_session()
+            stmt = (
+                insert(Book).values(**values).returning(Book).options(*_summary_options)
+            )
+            book = await session.scalar(stmt)
+            return book
         except Exception as e:
             raise Exception(f"Error creating book: {str(e)}")
 
     @staticmethod
-    async def update(book):
+    async def update(book_id, values):
+        """Update a book and return it via RETURNING, or None if it does not exist."""
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                await session.commit()
-                return book
+            session = get_session()
+            # RETURNING refreshes the columns of a book already in the session
+            # but not its loaded relations, which may now be other rows
+            loaded = session.identity_map.get(session.identity_key(Book, book_id))
+            if loaded is not None:
+                session.expire(loaded, ["author", "publisher"])
+            stmt = (
+                update(Book)
+                .where(Book.id == book_id)
+                .values(**values)
+                .returning(Book)
+                .options(*_summary_options)
+                .execution_options(populate_existing=True)
+            )
+            book = await session.scalar(stmt)
+            return book
         except Exception as e:
             raise Exception(f"Error updating book: {str(e)}")
 
     @staticmethod
     async def delete(book):
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                await session.delete(book)
-                await session.commit()
+            session = get_session()
+            await session.execute(delete(Book).where(Book.id == book.id))
         except Exception as e:
             raise Exception(f"Error deleting book: {str(e)}")
 
     @staticmethod
-    async def search_by_title(title, page=1, per_page=10):
+    @coalesced
+    async def search_by_title(title, page=1, per_page=10, fields=None, columns=False):
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                stmt = (
-                    select(Book)
-                    .options(selectinload(Book.author), selectinload(Book.publisher))
-                    .where(Book.title.ilike(f"%{title}%"))
+            session = get_session()
+            stmt = _match_title(_list_select(fields, columns), title)
+            if fts_query(title) is not None:
+                # Title matches weigh ten times a description match
+                stmt = stmt.order_by(
+                    literal_column("bm25(books_fts, 10.0, 1.0)"), Book.id
                 )
-                result = await session.execute(stmt)
-                books = result.scalars().all()
-                start = (page - 1) * per_page
-                end = start + per_page
-                return books[start:end]
+            return await paginate(session, stmt, page, per_page, rows=columns)
         except Exception as e:
             raise Exception(f"Error searching books: {str(e)}")
 
     @staticmethod
-    async def get_by_author(author_id, page=1, per_page=10):
+    @coalesced
+    async def get_by_author(author_id, page=1, per_page=10, fields=None):
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                stmt = (
-                    select(Book)
-                    .options(selectinload(Book.author), selectinload(Book.publisher))
-                    .where(Book.author_id == author_id)
-                )
-                result = await session.execute(stmt)
-                books = result.scalars().all()
-                start = (page - 1) * per_page
-                end = start + per_page
-                return books[start:end]
+            session = get_session()
+            stmt = (
+                select(Book)
+                .options(*_list_load(fields))
+                .where(Book.author_id == author_id)
+                .order_by(Book.id)
+            )
+            return await paginate(session, stmt, page, per_page)
         except Exception as e:
             raise Exception(f"Error fetching books by author: {str(e)}")
 
     @staticmethod
-    async def get_by_publisher(publisher_id, page=1, per_page=10):
+    @coalesced
+    async def get_by_publisher(publisher_id, page=1, per_page=10, fields=None):
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                stmt = (
-                    select(Book)
-                    .options(selectinload(Book.author), selectinload(Book.publisher))
-                    .where(Book.publisher_id == publisher_id)
-                )
-                result = await session.execute(stmt)
-                books = result.scalars().all()
-                start = (page - 1) * per_page
-                end = start + per_page
-                return books[start:end]
+            session = get_session()
+            stmt = (
+                select(Book)
+                .options(*_list_load(fields))
+                .where(Book.publisher_id == publisher_id)
+                .order_by(Book.id)
+            )
+            return await paginate(session, stmt, page, per_page)
         except Exception as e:
             raise Exception(f"Error fetching books by publisher: {str(e)}")
@@ -0,0 +1,9 @@
+import re
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query that ANDs a prefix match per word."""
+    tokens = re.findall(r"\w+", text)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
@@ -1,67 +1,81 @@
-from quart import current_app
+from app.extensions import get_session
+from sqlalchemy import insert, update
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
+from app.repositories.pagination import paginate
+from app.models.book import Book
 from app.models.insights import Insight
 
+# The related book is only dumped through BookSummarySchema
+_book_summary = selectinload(Insight.book).load_only(Book.id, Book.title)
+
 
 class InsightsRepository:
     @staticmethod
     async def get_all(page=1, per_page=10):
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                stmt = select(Insight).options(selectinload(Insight.book))
-                result = await session.execute(stmt)
-                insights = result.scalars().all()
-                start = (page - 1) * per_page
-                end = start + per_page
-                return insights[start:end]
+            session = get_session()
+            stmt = (
+                select(Insight).options(selectinload(Insight.book)).order_by(Insight.id)
+            )
+            return await paginate(session, stmt, page, per_page)
         except Exception as e:
             raise Exception(f"Error fetching insights: {str(e)}")
 
     @staticmethod
     async def get_by_id(insight_id):
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                stmt = (
-                    select(Insight)
-                    .options(selectinload(Insight.book))
-                    .where(Insight.id == insight_id)
-                )
-                result = await session.execute(stmt)
-                return result.scalar_one_or_none()
+            session = get_session()
+            stmt = (
+                select(Insight)
+                .options(selectinload(Insight.book))
+                .where(Insight.id == insight_id)
+            )
+            result = await session.execute(stmt)
+            return result.scalar_one_or_none()
         except Exception as e:
             raise Exception(f"Error fetching insight by id: {str(e)}")
 
     @staticmethod
-    async def create(insight):
+    async def create(values):
+        """Insert an insight and return it, with its book, via RETURNING."""
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                session.add(insight)
-                await session.commit()
-                return insight
+            session = get_session()
+            stmt = (
+                insert(Insight)
+                .values(**values)
+                .returning(Insight)
+                .options(_book_summary)
+            )
+            insight = await session.scalar(stmt)
+            return insight
         except Exception as e:
             raise Exception(f"Error creating insight: {str(e)}")
 
     @staticmethod
-    async def update(insight):
+    async def update(insight_id, values):
+        """Update an insight and return it via RETURNING, or None if missing."""
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                await session.commit()
-                return insight
+            session = get_session()
+            stmt = (
+                update(Insight)
+                .where(Insight.id == insight_id)
+                .values(**values)
+                .returning(Insight)
+                .options(_book_summary)
+                .execution_options(populate_existing=True)
+            )
+            insight = await session.scalar(stmt)
+            return insight
         except Exception as e:
             raise Exception(f"Error updating insight: {str(e)}")
 
     @staticmethod
     async def delete(insight):
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                await session.delete(insight)
-                await session.commit()
-                return True
+            session = get_session()
+            await session.delete(insight)
+            await session.flush()
+            return True
         except Exception as e:
             raise Exception(f"Error deleting insight: {str(e)}")
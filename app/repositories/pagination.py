@@ -0,0 +1,94 @@
+from math import ceil
+from itsdangerous import BadSignature, URLSafeSerializer
+from quart import current_app
+from sqlalchemy import func, tuple_
+from sqlalchemy.future import select
+
+
+class Pagination:
+    def __init__(self, items, page, per_page, total, columns=None):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+        # Names of the values in each item when the items are rows
+        self.columns = columns
+
+    @property
+    def pages(self):
+        if not self.per_page:
+            return 0
+        return ceil(self.total / self.per_page)
+
+
+async def paginate(session, stmt, page=1, per_page=10, rows=False):
+    """Run ``stmt`` with LIMIT/OFFSET applied in SQL plus a COUNT for the total.
+
+    With ``rows`` the items are the result rows rather than their first
+    column, e.g. for a select of plain columns.
+    """
+    page = max(page, 1)
+    per_page = max(per_page, 1)
+    count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+    total = await session.scalar(count_stmt)
+    result = await session.execute(stmt.limit(per_page).offset((page - 1) * per_page))
+    if rows:
+        return Pagination(result.all(), page, per_page, total, list(result.keys()))
+    return Pagination(result.scalars().all(), page, per_page, total)
+
+
+class KeysetPagination:
+    def __init__(self, items, per_page, next_key=None, columns=None):
+        self.items = items
+        self.per_page = per_page
+        self.next_key = next_key
+        self.columns = columns
+
+
+async def seek(session, stmt, key_columns, after=None, per_page=10, rows=False):
+    """Return the page of ``stmt`` that follows ``after`` in ``key_columns`` order.
+
+    The last column must be unique (the primary key) so the ordering is total.
+    One extra row is fetched to tell whether another page exists. With
+    ``rows`` the items are result rows, which must carry the key columns.
+    """
+    per_page = max(per_page, 1)
+    if after is not None:
+        stmt = stmt.where(tuple_(*key_columns) > tuple_(*after))
+    stmt = stmt.order_by(*key_columns).limit(per_page + 1)
+    result = await session.execute(stmt)
+    columns = list(result.keys()) if rows else None
+    fetched = result.all() if rows else result.scalars().all()
+    items = fetched[:per_page]
+    next_key = None
+    if len(fetched) > per_page:
+        next_key = [getattr(items[-1], column.key) for column in key_columns]
+    return KeysetPagination(items, per_page, next_key, columns)
+
+
+def encode_cursor(key, scope):
+    """Sign a keyset position so clients cannot forge arbitrary seeks."""
+    serializer = URLSafeSerializer(current_app.config["SECRET_KEY"], salt=scope)
+    return serializer.dumps(key)
+
+
+def decode_cursor(cursor, scope):
+    serializer = URLSafeSerializer(current_app.config["SECRET_KEY"], salt=scope)
+    try:
+        key = serializer.loads(cursor)
+    except BadSignature:
+        raise ValueError("Invalid cursor")
+    if not isinstance(key, list):
+        raise ValueError("Invalid cursor")
+    return key
+
+
+async def stream_batches(session, stmt, batch_size=1000):
+    """Yield the rows of ``stmt`` in lists of up to ``batch_size``.
+
+    Rows are fetched from the cursor as the batches are consumed, so memory
+    stays flat however many rows ``stmt`` returns.
+    """
+    result = await session.stream(stmt.execution_options(yield_per=batch_size))
+    async for rows in result.partitions():
+        yield rows
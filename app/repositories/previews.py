@@ -0,0 +1,52 @@
+from quart import current_app
+from sqlalchemy import func
+from sqlalchemy.future import select
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models.book import Book
+
+
+async def load_book_previews(session, owners, foreign_key):
+    """Attach the first NESTED_BOOKS_LIMIT books and a books_count to each owner.
+
+    ``owners`` are authors or publishers and ``foreign_key`` the matching
+    ``Book`` column. The capped list is set as the loaded value of the
+    ``books`` relationship so it serializes like a normal eager load.
+    """
+    if not owners:
+        return
+    limit = current_app.config["NESTED_BOOKS_LIMIT"]
+    owner_ids = [owner.id for owner in owners]
+
+    count_stmt = (
+        select(foreign_key, func.count())
+        .where(foreign_key.in_(owner_ids))
+        .group_by(foreign_key)
+    )
+    counts = dict((await session.execute(count_stmt)).all())
+
+    previews = {owner_id: [] for owner_id in owner_ids}
+    if limit > 0:
+        ranked = (
+            select(
+                Book.id,
+                func.row_number()
+                .over(partition_by=foreign_key, order_by=Book.id)
+                .label("rank"),
+            )
+            .where(foreign_key.in_(owner_ids))
+            .subquery()
+        )
+        book_stmt = (
+            select(Book)
+            .options(load_only(Book.id, Book.title, foreign_key))
+            .join(ranked, ranked.c.id == Book.id)
+            .where(ranked.c.rank <= limit)
+            .order_by(Book.id)
+        )
+        for book in (await session.execute(book_stmt)).scalars():
+            previews[getattr(book, foreign_key.key)].append(book)
+
+    for owner in owners:
+        set_committed_value(owner, "books", previews[owner.id])
+        owner.books_count = counts.get(owner.id, 0)
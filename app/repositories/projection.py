@@ -0,0 +1,38 @@
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only, raiseload
+
+# Read by the ETag version functions, so loaded whatever fields are asked for
+VERSION_COLUMNS = ("id", "updated_at")
+
+
+def load_fields(model, fields, relations=None, required=()):
+    """Loader options that load only what dumping ``fields`` of ``model`` reads.
+
+    ``relations`` maps relationship names to the eager loader used when the
+    field is requested; its foreign key columns are loaded along with it.
+    ``required`` names further columns the query itself needs, such as
+    keyset columns. Anything else raises if accessed.
+    """
+    mapper = inspect(model)
+    relations = relations or {}
+    columns = {*VERSION_COLUMNS, *required}
+    columns.update(name for name in fields if name in mapper.column_attrs)
+    options = []
+    for name, relationship in mapper.relationships.items():
+        if name in fields and name in relations:
+            options.append(relations[name])
+            columns.update(
+                mapper.get_property_by_column(column).key
+                for column in relationship.local_columns
+            )
+        else:
+            options.append(raiseload(getattr(model, name)))
+    load = load_only(
+        *(getattr(model, name) for name in sorted(columns)), raiseload=True
+    )
+    return (load, *options)
+
+
+def wants_previews(fields):
+    """Whether a list of authors or publishers dumping ``fields`` embeds books."""
+    return fields is None or "books" in fields or "books_count" in fields
@@ -1,85 +1,166 @@
-from quart import current_app
+from app.extensions import get_session
+from sqlalchemy import delete, insert, update
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from app.repositories.pagination import paginate, seek, stream_batches
+from app.repositories.singleflight import coalesced
+from app.repositories.previews import load_book_previews
+from app.repositories.projection import load_fields, wants_previews
+from app.cache import cache_entity, cache_missing, lookup_entity
+from app.models.book import Book
 from app.models.publisher import Publisher
 
 
+def _list_load(fields, *required):
+    """Loader options for a list query dumping ``fields``, or every list field."""
+    if fields is None:
+        return ()
+    return load_fields(Publisher, fields, required=required)
+
+
+# Exports carry the publisher table's own columns; relations are exported by id
+_export_columns = (
+    Publisher.id,
+    Publisher.name,
+    Publisher.founding_year,
+    Publisher.website,
+    Publisher.created_at,
+    Publisher.updated_at,
+)
+
+
 class PublisherRepository:
     @staticmethod
-    async def get_all(page=1, per_page=10):
+    @coalesced
+    async def get_all(page=1, per_page=10, fields=None):
+        try:
+            session = get_session()
+            stmt = select(Publisher).options(*_list_load(fields)).order_by(Publisher.id)
+            pagination = await paginate(session, stmt, page, per_page)
+            if wants_previews(fields):
+                await load_book_previews(session, pagination.items, Book.publisher_id)
+            return pagination
+        except Exception as e:
+            raise Exception(f"Error fetching publishers: {str(e)}")
+
+    @staticmethod
+    @coalesced
+    async def get_all_after(after=None, per_page=10, fields=None, name=None):
+        """Seek the next page by name, optionally among publishers matching ``name``."""
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                stmt = select(Publisher).options(selectinload(Publisher.books))
-                result = await session.execute(stmt)
-                publishers = result.scalars().all()
-                start = (page - 1) * per_page
-                end = start + per_page
-                return publishers[start:end]
+            session = get_session()
+            stmt = select(Publisher).options(*_list_load(fields, "name"))
+            if name:
+                stmt = stmt.where(Publisher.name.ilike(f"%{name}%"))
+            key_columns = (Publisher.name, Publisher.id)
+            pagination = await seek(session, stmt, key_columns, after, per_page)
+            if wants_previews(fields):
+                await load_book_previews(session, pagination.items, Book.publisher_id)
+            return pagination
         except Exception as e:
             raise Exception(f"Error fetching publishers: {str(e)}")
 
     @staticmethod
+    async def stream_all(batch_size=1000):
+        """Yield the export columns of every publisher, by id, in batches of rows."""
+        try:
+            session = get_session()
+            stmt = select(*_export_columns).order_by(Publisher.id)
+            async for rows in stream_batches(session, stmt, batch_size):
+                yield rows
+        except Exception as e:
+            raise Exception(f"Error exporting publishers: {str(e)}")
+
+    @staticmethod
+    @coalesced
     async def get_by_id(publisher_id):
+        """Fetch a publisher through the entity cache."""
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                stmt = (
-                    select(Publisher)
-                    .options(selectinload(Publisher.books))
-                    .where(Publisher.id == publisher_id)
+            key = ("publisher", publisher_id)
+            hit, publisher = lookup_entity(key)
+            if hit:
+                return publisher
+            session = get_session()
+            stmt = select(Publisher).where(Publisher.id == publisher_id)
+            result = await session.execute(stmt)
+            publisher = result.scalar_one_or_none()
+            if publisher is not None:
+                await load_book_previews(session, [publisher], Book.publisher_id)
+                cache_entity(
+                    session,
+                    key,
+                    publisher,
+                    related=publisher.books,
+                    depends_on=[("book", book.id) for book in publisher.books],
                 )
-                result = await session.execute(stmt)
-                return result.scalar_one_or_none()
+            else:
+                cache_missing(key)
+            return publisher
         except Exception as e:
             raise Exception(f"Error fetching publisher by id: {str(e)}")
 
     @staticmethod
-    async def create(publisher):
+    async def create(values):
+        """Insert a publisher and return it as stored, via RETURNING."""
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                session.add(publisher)
-                await session.commit()
-                return publisher
+            session = get_session()
+            stmt = insert(Publisher).values(**values).returning(Publisher)
+            publisher = await session.scalar(stmt)
+            # A new publisher has no books yet, so no preview query is needed
+            set_committed_value(publisher, "books", [])
+            publisher.books_count = 0
+            return publisher
         except Exception as e:
             raise Exception(f"Error creating publisher: {str(e)}")
 
     @staticmethod
-    async def update(publisher):
+    async def update(publisher, values):
+        """Update a publisher via RETURNING and return the stored row."""
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                await session.commit()
-                return publisher
+            session = get_session()
+            stmt = (
+                update(Publisher)
+                .where(Publisher.id == publisher.id)
+                .values(**values)
+                .returning(Publisher)
+            )
+            updated = await session.scalar(stmt)
+            # Books are not touched, so the previews loaded with it stay valid
+            set_committed_value(updated, "books", list(publisher.books))
+            updated.books_count = publisher.books_count
+            return updated
         except Exception as e:
             raise Exception(f"Error updating publisher: {str(e)}")
 
     @staticmethod
     async def delete(publisher):
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                await session.delete(publisher)
-                await session.commit()
-                return True
+            session = get_session()
+            # Only a preview of the books is loaded, so detach all of them in SQL
+            await session.execute(
+                update(Book)
+                .where(Book.publisher_id == publisher.id)
+                .values(publisher_id=None)
+            )
+            await session.execute(delete(Publisher).where(Publisher.id == publisher.id))
+            return True
         except Exception as e:
             raise Exception(f"Error deleting publisher: {str(e)}")
 
     @staticmethod
-    async def search_by_name(name, page=1, per_page=10):
+    @coalesced
+    async def search_by_name(name, page=1, per_page=10, fields=None):
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                stmt = (
-                    select(Publisher)
-                    .options(selectinload(Publisher.books))
-                    .where(Publisher.name.ilike(f"%{name}%"))
-                )
-                result = await session.execute(stmt)
-                publishers = result.scalars().all()
-                start = (page - 1) * per_page
-                end = start + per_page
-                return publishers[start:end]
+            session = get_session()
+            stmt = (
+                select(Publisher)
+                .options(*_list_load(fields))
+                .where(Publisher.name.ilike(f"%{name}%"))
+                .order_by(Publisher.id)
+            )
+            pagination = await paginate(session, stmt, page, per_page)
+            if wants_previews(fields):
+                await load_book_previews(session, pagination.items, Book.publisher_id)
+            return pagination
         except Exception as e:
             raise Exception(f"Error searching publishers: {str(e)}")
@@ -0,0 +1,111 @@
+import asyncio
+from functools import wraps
+from quart import current_app, g
+from sqlalchemy import inspect
+
+
+class _LeaderCancelled(Exception):
+    pass
+
+
+class SingleFlight:
+    """Run identical concurrent calls once and share the result.
+
+    The first caller for a key runs the call; callers arriving while it is
+    in flight await the same future. ``coalesced`` counts those followers.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._in_flight = {}
+
+    async def do(self, key, call):
+        while True:
+            future = self._in_flight.get(key)
+            if future is None:
+                break
+            self.coalesced += 1
+            try:
+                # Shielded so a cancelled follower does not cancel the others
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                continue
+        self.calls += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            # Followers retry, one of them becoming the new leader
+            future.set_exception(_LeaderCancelled())
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+            if future.done() and not future.cancelled():
+                # Mark the exception as retrieved when nobody else awaited it
+                future.exception()
+
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
+
+
+def _detach(session, result):
+    """Expunge the entities in ``result``, and those loaded on them, from ``session``.
+
+    ``result`` is an entity or a page of items; plain rows are left alone.
+    """
+    pending = list(getattr(result, "items", [result]))
+    seen = set()
+    while pending:
+        instance = pending.pop()
+        state = inspect(instance, raiseerr=False)
+        if state is None or not hasattr(state, "mapper") or id(instance) in seen:
+            continue
+        seen.add(id(instance))
+        if instance in session:
+            session.expunge(instance)
+        for relationship in state.mapper.relationships:
+            value = state.dict.get(relationship.key)
+            if isinstance(value, list):
+                pending.extend(value)
+            elif value is not None:
+                pending.append(value)
+
+
+def coalesced(method):
+    """Share a repository read between identical concurrent calls.
+
+    Results are shared across requests like cached entities (see
+    ``app.cache.cache_entity``), so the leader detaches them from its
+    session. A request that has already written runs the read itself, so
+    other requests never see its uncommitted rows.
+    """
+
+    @wraps(method)
+    async def wrapper(*args, **kwargs):
+        session = g.get("db_session")
+        if session is not None and session.info.get("has_writes"):
+            return await method(*args, **kwargs)
+
+        async def lead():
+            result = await method(*args, **kwargs)
+            session = g.get("db_session")
+            if session is not None:
+                _detach(session, result)
+            return result
+
+        key = (method.__qualname__, repr(args), repr(sorted(kwargs.items())))
+        return await current_app.single_flight.do(key, lead)
+
+    return wrapper
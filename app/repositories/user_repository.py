@@ -1,6 +1,6 @@
-from app.extensions import async_db as db
 from app.models.user import User
-from quart import current_app
+from app.extensions import get_session
+from sqlalchemy import update
 from sqlalchemy.future import select
 
 
@@ -8,64 +8,72 @@ class UserRepository:
     @staticmethod
     async def create(user):
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                session.add(user)
-                await session.commit()
-                return user
+            session = get_session()
+            session.add(user)
+            await session.flush()
+            return user
         except Exception as e:
             raise Exception(f"Error creating user: {str(e)}")
 
     @staticmethod
     async def get_by_id(user_id):
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                stmt = select(User).where(User.id == user_id)
-                result = await session.execute(stmt)
-                return result.scalar_one_or_none()
+            session = get_session()
+            stmt = select(User).where(User.id == user_id)
+            result = await session.execute(stmt)
+            return result.scalar_one_or_none()
         except Exception as e:
             raise Exception(f"Error fetching user by id: {str(e)}")
 
     @staticmethod
     async def get_by_username(username):
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                stmt = select(User).where(User.username == username)
-                result = await session.execute(stmt)
-                return result.scalar_one_or_none()
+            session = get_session()
+            stmt = select(User).where(User.username == username)
+            result = await session.execute(stmt)
+            return result.scalar_one_or_none()
         except Exception as e:
             raise Exception(f"Error fetching user by username: {str(e)}")
 
     @staticmethod
     async def get_by_email(email):
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                stmt = select(User).where(User.email == email)
-                result = await session.execute(stmt)
-                return result.scalar_one_or_none()
+            session = get_session()
+            stmt = select(User).where(User.email == email)
+            result = await session.execute(stmt)
+            return result.scalar_one_or_none()
         except Exception as e:
             raise Exception(f"Error fetching user by email: {str(e)}")
 
     @staticmethod
     async def update(user):
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                await session.commit()
-                return user
+            session = get_session()
+            await session.flush()
+            return user
         except Exception as e:
             raise Exception(f"Error updating user: {str(e)}")
 
+    @staticmethod
+    async def replace_password_hash(user_id, old_hash, new_hash):
+        """Swap the hash only if it is still ``old_hash``; returns whether it did."""
+        try:
+            session = get_session()
+            result = await session.execute(
+                update(User)
+                .where(User.id == user_id, User.password_hash == old_hash)
+                .values(password_hash=new_hash)
+            )
+            return result.rowcount == 1
+        except Exception as e:
+            raise Exception(f"Error updating password hash: {str(e)}")
+
     @staticmethod
     async def delete(user):
         try:
-            async_session = current_app.async_session
-            async with async_session() as session:
-                await session.delete(user)
-                await session.commit()
-                return True
+            session = get_session()
+            await session.delete(user)
+            await session.flush()
+            return True
         except Exception as e:
             raise Exception(f"Error deleting user: {str(e)}")
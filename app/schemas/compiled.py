@@ -0,0 +1,119 @@
+import datetime as dt
+import decimal
+from collections.abc import Mapping
+from marshmallow import fields, missing
+from marshmallow.decorators import POST_DUMP, PRE_DUMP
+from marshmallow.utils import ensure_text_type
+
+
+class CompiledSchema:
+    """Drop-in ``dump`` for a marshmallow schema, generated from its fields.
+
+    marshmallow walks every field object and nested schema per row; this
+    generates one Python function per schema that reads the attributes and
+    formats them inline. Int, Str, Decimal, Date, DateTime and Nested fields
+    are compiled; any other field, and any schema with dump hooks, falls
+    back to marshmallow so the output stays identical.
+
+    With ``native=True`` Decimal, Date and DateTime values are left as
+    Python objects for the app's JSON provider to encode, which writes the
+    same text marshmallow would.
+    """
+
+    def __init__(self, schema, native=False):
+        self.schema = schema
+        self.many = schema.many
+        self.native = native
+        if schema._has_processors(PRE_DUMP) or schema._has_processors(POST_DUMP):
+            self._dump_one = lambda obj: schema.dump(obj, many=False)
+        else:
+            self._dump_one = _compile(schema, native)
+
+    def dump(self, obj, *, many=None):
+        many = self.many if many is None else many
+        if many:
+            dump_one = self._dump_one
+            return [dump_one(item) for item in obj]
+        return self._dump_one(obj)
+
+
+def compile_schema(schema, native=False):
+    return CompiledSchema(schema, native)
+
+
+def _compile(schema, native):
+    namespace = {
+        "missing": missing,
+        "Mapping": Mapping,
+        "Decimal": decimal.Decimal,
+        "date": dt.date,
+        "datetime": dt.datetime,
+        "ensure_text_type": ensure_text_type,
+        "to_iso_date": dt.date.isoformat,
+        "schema": schema,
+    }
+    lines = [
+        "def dump_one(obj):",
+        # utils.get_value also reads mapping keys and dotted paths
+        "    if isinstance(obj, Mapping):",
+        "        return schema.dump(obj, many=False)",
+        "    out = {}",
+    ]
+    for index, (name, field) in enumerate(schema.dump_fields.items()):
+        attribute = field.attribute or name
+        key = name if field.data_key is None else field.data_key
+        expression = _expression(field, index, namespace, native)
+        if expression is None or "." in attribute or field.dump_default is not missing:
+            namespace[f"field_{index}"] = field
+            lines += [
+                f"    v = field_{index}.serialize({name!r}, obj, accessor=schema.get_attribute)",
+                "    if v is not missing:",
+                f"        out[{key!r}] = v",
+            ]
+        else:
+            lines += [
+                f"    v = getattr(obj, {attribute!r}, missing)",
+                "    if v is not missing:",
+                f"        out[{key!r}] = None if v is None else {expression}",
+            ]
+    lines.append("    return out")
+    exec("\n".join(lines), namespace)
+    return namespace["dump_one"]
+
+
+def _expression(field, index, namespace, native):
+    """Inline formatting of a non-None ``v`` for ``field``, or None to fall back."""
+    kind = type(field)
+    if kind is fields.Integer and not field.as_string:
+        return "int(v)"
+    if kind is fields.String:
+        return "v if type(v) is str else ensure_text_type(v)"
+    if (
+        kind is fields.Decimal
+        and field.as_string
+        and field.places is None
+        and not field.allow_nan
+    ):
+        if native:
+            return "v if type(v) is Decimal else Decimal(str(v))"
+        return "format(v if type(v) is Decimal else Decimal(str(v)), 'f')"
+    if kind is fields.Date and (field.format or "iso") in ("iso", "iso8601"):
+        if native:
+            return "v if type(v) is date else to_iso_date(v)"
+        return "to_iso_date(v)"
+    if kind is fields.DateTime and (field.format or "iso") in ("iso", "iso8601"):
+        if native:
+            return "v if type(v) is datetime else v.isoformat()"
+        return "v.isoformat()"
+    if kind is fields.Nested:
+        nested = field.schema
+        namespace[f"nested_{index}"] = CompiledSchema(nested, native)
+        many = "True" if nested.many or field.many else "False"
+        return f"nested_{index}.dump(v, many={many})"
+    if kind is fields.List and type(field.inner) is fields.Nested:
+        inner = field.inner.schema
+        if inner.many or field.inner.many:
+            return None
+        namespace[f"nested_{index}"] = CompiledSchema(inner, native)
+        return f"nested_{index}.dump(v, many=True)"
+    return None
@@ -12,6 +12,7 @@ class PublisherSchema(Schema):
     books = fields.List(
         fields.Nested("app.schemas.book.BookSummarySchema"), dump_only=True
     )
+    books_count = fields.Int(dump_only=True)
 
 
 class BookSummarySchema(Schema):
@@ -1,6 +1,8 @@
 from app.repositories.user_repository import UserRepository
 from quart_jwt_extended import create_access_token, create_refresh_token
-from werkzeug.security import generate_password_hash
+from quart import current_app
+from app.extensions import get_session
+from app.passwords import hash_password, password_needs_rehash, verify_password
 from app.models.user import User
 
 
@@ -12,7 +14,11 @@ class AuthService:
                 return {"success": False, "message": "Username already exists"}, 400
             if await UserRepository.get_by_email(email):
                 return {"success": False, "message": "Email already registered"}, 400
-            user = User(username=username, email=email, password=password)
+            user = User(
+                username=username,
+                email=email,
+                password_hash=await hash_password(password),
+            )
             await UserRepository.create(user)
             return {
                 "success": True,
@@ -26,7 +32,11 @@ class AuthService:
     async def login(email, password):
         try:
             user = await UserRepository.get_by_email(email)
-            if user and user.check_password(password):
+            if user and await verify_password(user.password_hash, password):
+                if await password_needs_rehash(user.password_hash):
+                    current_app.add_background_task(
+                        AuthService.rehash_password, user.id, user.password_hash, password
+                    )
                 access_token = create_access_token(identity=user.id)
                 refresh_token = create_refresh_token(identity=user.id)
                 return {
@@ -39,6 +49,17 @@ class AuthService:
         except Exception as e:
             return {"success": False, "message": str(e)}, 500
 
+    @staticmethod
+    async def rehash_password(user_id, old_hash, password):
+        """Re-hash a password with the configured parameters after a login.
+
+        Runs as a background task in its own app context and transaction;
+        a password changed in the meantime is left alone.
+        """
+        new_hash = await hash_password(password)
+        if await UserRepository.replace_password_hash(user_id, old_hash, new_hash):
+            await get_session().commit()
+
     @staticmethod
     async def refresh(user_id):
         try:
@@ -56,9 +77,9 @@ class AuthService:
             user = await UserRepository.get_by_id(user_id)
             if not user:
                 return {"success": False, "message": "User not found"}, 404
-            if not user.check_password(old_password):
+            if not await verify_password(user.password_hash, old_password):
                 return {"success": False, "message": "Incorrect password"}, 401
-            user.password_hash = generate_password_hash(new_password)
+            user.password_hash = await hash_password(new_password)
             await UserRepository.update(user)
             return {"success": True, "message": "Password changed successfully"}, 200
         except Exception as e:
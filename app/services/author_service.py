@@ -1,25 +1,56 @@
 from app.repositories.author_repository import AuthorRepository
+from app.repositories.pagination import encode_cursor, decode_cursor
 from app.models.author import Author
+from app.cache import bump_generation, discard, invalidate
 
 
 class AuthorService:
     @staticmethod
-    async def get_all(page=1, per_page=10):
+    async def get_all(page=1, per_page=10, fields=None):
         try:
-            authors = await AuthorRepository.get_all(page, per_page)
+            pagination = await AuthorRepository.get_all(page, per_page, fields=fields)
             return {
                 "success": True,
-                "data": authors,
+                "data": pagination.items,
                 "pagination": {
-                    "page": page,
-                    "per_page": per_page,
-                    "total": len(authors),
-                    "pages": 1,
+                    "page": pagination.page,
+                    "per_page": pagination.per_page,
+                    "total": pagination.total,
+                    "pages": pagination.pages,
                 },
             }, 200
         except Exception as e:
             return {"success": False, "message": str(e)}, 500
 
+    @staticmethod
+    async def get_all_after(cursor=None, per_page=10, fields=None, name=None):
+        try:
+            after = decode_cursor(cursor, "authors") if cursor else None
+        except ValueError as e:
+            return {"success": False, "message": str(e)}, 400
+        try:
+            pagination = await AuthorRepository.get_all_after(
+                after, per_page, fields=fields, name=name
+            )
+            next_cursor = None
+            if pagination.next_key is not None:
+                next_cursor = encode_cursor(pagination.next_key, "authors")
+            return {
+                "success": True,
+                "data": pagination.items,
+                "pagination": {
+                    "per_page": pagination.per_page,
+                    "next_cursor": next_cursor,
+                },
+            }, 200
+        except Exception as e:
+            return {"success": False, "message": str(e)}, 500
+
+    @staticmethod
+    async def export(batch_size=1000):
+        # Rows are only read as the response streams them, in its own context
+        return {"success": True, "data": AuthorRepository.stream_all(batch_size)}, 200
+
     @staticmethod
     async def get_by_id(author_id):
         try:
@@ -33,18 +64,14 @@ class AuthorService:
     @staticmethod
     async def create(author_data):
         try:
+            fields = ("first_name", "last_name", "biography", "birth_date")
             if isinstance(author_data, Author):
-                author = author_data
+                values = {field: getattr(author_data, field) for field in fields}
             else:
-                author = Author(
-                    first_name=author_data.get("first_name"),
-                    last_name=author_data.get("last_name"),
-                    biography=author_data.get("biography"),
-                    birth_date=author_data.get("birth_date"),
-                )
-            await AuthorRepository.create(author)
-            # Re-fetch with books eagerly loaded
-            author = await AuthorRepository.get_by_id(author.id)
+                values = {field: author_data.get(field) for field in fields}
+            author = await AuthorRepository.create(values)
+            discard(("author", author.id))
+            bump_generation("authors")
             return {
                 "success": True,
                 "data": author,
@@ -59,27 +86,25 @@ class AuthorService:
             author = await AuthorRepository.get_by_id(author_id)
             if not author:
                 return {"success": False, "message": "Author not found"}, 404
+            fields = ("first_name", "last_name", "biography", "birth_date")
             if isinstance(author_data, dict):
-                if "first_name" in author_data:
-                    author.first_name = author_data["first_name"]
-                if "last_name" in author_data:
-                    author.last_name = author_data["last_name"]
-                if "biography" in author_data:
-                    author.biography = author_data["biography"]
-                if "birth_date" in author_data:
-                    author.birth_date = author_data["birth_date"]
+                changes = {
+                    field: author_data[field]
+                    for field in fields
+                    if field in author_data
+                }
             elif isinstance(author_data, Author):
-                if author_data.first_name:
-                    author.first_name = author_data.first_name
-                if author_data.last_name:
-                    author.last_name = author_data.last_name
-                if author_data.biography:
-                    author.biography = author_data.biography
-                if author_data.birth_date:
-                    author.birth_date = author_data.birth_date
-            await AuthorRepository.update(author)
-            # Re-fetch with books eagerly loaded
-            author = await AuthorRepository.get_by_id(author.id)
+                changes = {
+                    field: getattr(author_data, field)
+                    for field in fields
+                    if getattr(author_data, field)
+                }
+            else:
+                changes = {}
+            if changes:
+                author = await AuthorRepository.update(author, changes)
+                invalidate(("author", author_id))
+                bump_generation("authors")
             return {
                 "success": True,
                 "data": author,
@@ -94,13 +119,15 @@ class AuthorService:
             author = await AuthorRepository.get_by_id(author_id)
             if not author:
                 return {"success": False, "message": "Author not found"}, 404
-            if hasattr(author, "books") and len(author.books) > 0:
+            if getattr(author, "books_count", 0) > 0:
                 return {
                     "success": False,
                     "message": "Cannot delete author with books. Remove books first.",
                 }, 400
             success = await AuthorRepository.delete(author)
             if success:
+                invalidate(("author", author_id))
+                bump_generation("authors")
                 return {"success": True, "message": "Author deleted successfully"}, 200
             else:
                 return {
@@ -111,17 +138,19 @@ class AuthorService:
             return {"success": False, "message": str(e)}, 500
 
     @staticmethod
-    async def search_by_name(name, page=1, per_page=10):
+    async def search_by_name(name, page=1, per_page=10, fields=None):
         try:
-            authors = await AuthorRepository.search_by_name(name, page, per_page)
+            pagination = await AuthorRepository.search_by_name(
+                name, page, per_page, fields=fields
+            )
             return {
                 "success": True,
-                "data": authors,
+                "data": pagination.items,
                 "pagination": {
-                    "page": page,
-                    "per_page": per_page,
-                    "total": len(authors),
-                    "pages": 1,
+                    "page": pagination.page,
+                    "per_page": pagination.per_page,
+                    "total": pagination.total,
+                    "pages": pagination.pages,
                 },
             }, 200
         except Exception as e:
@@ -1,27 +1,67 @@
 from app.repositories.book_repository import BookRepository
+from app.repositories.pagination import encode_cursor, decode_cursor
 from app.repositories.author_repository import AuthorRepository
 from app.repositories.publisher_repository import PublisherRepository
-from app.models.book import Book
+from app.cache import bump_generation, discard, invalidate
 
 
 class BookService:
     @staticmethod
-    async def get_all(page=1, per_page=10):
+    async def get_all(page=1, per_page=10, fields=None, columns=False):
         try:
-            books = await BookRepository.get_all(page, per_page)
-            return {
+            pagination = await BookRepository.get_all(
+                page, per_page, fields=fields, columns=columns
+            )
+            result = {
                 "success": True,
-                "data": books,
+                "data": pagination.items,
                 "pagination": {
-                    "page": page,
-                    "per_page": per_page,
-                    "total": len(books),
-                    "pages": 1,  # For real pagination, implement total count
+                    "page": pagination.page,
+                    "per_page": pagination.per_page,
+                    "total": pagination.total,
+                    "pages": pagination.pages,
                 },
-            }, 200
+            }
+            if columns:
+                result["columns"] = pagination.columns
+            return result, 200
         except Exception as e:
             return {"success": False, "message": str(e)}, 500
 
+    @staticmethod
+    async def get_all_after(
+        cursor=None, per_page=10, fields=None, columns=False, title=None
+    ):
+        try:
+            after = decode_cursor(cursor, "books") if cursor else None
+        except ValueError as e:
+            return {"success": False, "message": str(e)}, 400
+        try:
+            pagination = await BookRepository.get_all_after(
+                after, per_page, fields=fields, columns=columns, title=title
+            )
+            next_cursor = None
+            if pagination.next_key is not None:
+                next_cursor = encode_cursor(pagination.next_key, "books")
+            result = {
+                "success": True,
+                "data": pagination.items,
+                "pagination": {
+                    "per_page": pagination.per_page,
+                    "next_cursor": next_cursor,
+                },
+            }
+            if columns:
+                result["columns"] = pagination.columns
+            return result, 200
+        except Exception as e:
+            return {"success": False, "message": str(e)}, 500
+
+    @staticmethod
+    async def export(batch_size=1000):
+        # Rows are only read as the response streams them, in its own context
+        return {"success": True, "data": BookRepository.stream_all(batch_size)}, 200
+
     @staticmethod
     async def get_by_id(book_id):
         try:
@@ -35,28 +75,35 @@ class BookService:
     @staticmethod
     async def create(book_data):
         try:
-            author = await AuthorRepository.get_by_id(book_data.get("author_id"))
-            if not author:
-                return {"success": False, "message": "Author not found"}, 404
-            publisher = await PublisherRepository.get_by_id(book_data.get("publisher_id"))
-            if not publisher:
-                return {"success": False, "message": "Publisher not found"}, 404
-            if book_data.get("isbn"):
-                existing_book = await BookRepository.get_by_isbn(book_data.get("isbn"))
-                if existing_book:
-                    return {"success": False, "message": "ISBN already exists"}, 400
-            book = Book(
-                title=book_data.get("title"),
-                isbn=book_data.get("isbn"),
-                publication_date=book_data.get("publication_date"),
-                price=book_data.get("price"),
-                description=book_data.get("description"),
+            checks = await BookRepository.check_references(
                 author_id=book_data.get("author_id"),
                 publisher_id=book_data.get("publisher_id"),
+                isbn=book_data.get("isbn") or None,
+            )
+            if not checks.author_exists:
+                return {"success": False, "message": "Author not found"}, 404
+            if not checks.publisher_exists:
+                return {"success": False, "message": "Publisher not found"}, 404
+            if checks.isbn_taken:
+                return {"success": False, "message": "ISBN already exists"}, 400
+            book = await BookRepository.create(
+                {
+                    "title": book_data.get("title"),
+                    "isbn": book_data.get("isbn"),
+                    "publication_date": book_data.get("publication_date"),
+                    "price": book_data.get("price"),
+                    "description": book_data.get("description"),
+                    "author_id": book_data.get("author_id"),
+                    "publisher_id": book_data.get("publisher_id"),
+                }
+            )
+            # The owners' cached book previews and counts are now stale
+            discard(
+                ("book", book.id),
+                ("author", book.author_id),
+                ("publisher", book.publisher_id),
             )
-            await BookRepository.create(book)
-            # Re-fetch with author and publisher eagerly loaded
-            book = await BookRepository.get_by_id(book.id)
+            bump_generation("books")
             return {
                 "success": True,
                 "data": book,
@@ -65,38 +112,142 @@ class BookService:
         except Exception as e:
             return {"success": False, "message": str(e)}, 500
 
+    @staticmethod
+    async def bulk_create(books, errors=None, batch_size=1000):
+        """Create many books, checking the references of all of them at once.
+
+        ``books`` maps each row's index in the request to its loaded data and
+        ``errors`` maps rows that failed validation to their messages. Rows
+        failing a check are reported and skipped; the rest are inserted.
+        """
+        try:
+            results = {
+                index: {
+                    "index": index,
+                    "success": False,
+                    "message": "Validation error",
+                    "errors": messages,
+                }
+                for index, messages in (errors or {}).items()
+            }
+            authors, publishers, taken = await BookRepository.find_references(
+                {book_data["author_id"] for book_data in books.values()},
+                {book_data["publisher_id"] for book_data in books.values()},
+                {
+                    book_data["isbn"]
+                    for book_data in books.values()
+                    if book_data.get("isbn")
+                },
+                batch_size,
+            )
+            accepted = []
+            for index, book_data in books.items():
+                isbn = book_data.get("isbn") or None
+                if book_data["author_id"] not in authors:
+                    message = "Author not found"
+                elif book_data["publisher_id"] not in publishers:
+                    message = "Publisher not found"
+                elif isbn in taken:
+                    message = "ISBN already exists"
+                else:
+                    message = None
+                if message:
+                    results[index] = {
+                        "index": index,
+                        "success": False,
+                        "message": message,
+                    }
+                    continue
+                if isbn:
+                    # Later rows of the same request may not reuse it either
+                    taken.add(isbn)
+                accepted.append(
+                    (
+                        index,
+                        {
+                            "title": book_data.get("title"),
+                            "isbn": isbn,
+                            "publication_date": book_data.get("publication_date"),
+                            "price": book_data.get("price"),
+                            "description": book_data.get("description"),
+                            "author_id": book_data["author_id"],
+                            "publisher_id": book_data["publisher_id"],
+                        },
+                    )
+                )
+            ids = await BookRepository.create_many(
+                [values for _, values in accepted], batch_size
+            )
+            for (index, _), book_id in zip(accepted, ids):
+                results[index] = {"index": index, "success": True, "id": book_id}
+            if ids:
+                # Clears "not found" entries for the new ids, and the owners'
+                # cached previews and counts
+                discard(
+                    *(("book", book_id) for book_id in ids),
+                    *{("author", values["author_id"]) for _, values in accepted},
+                    *{("publisher", values["publisher_id"]) for _, values in accepted},
+                )
+                bump_generation("books")
+            failed = len(results) - len(ids)
+            result = {
+                "success": not failed,
+                "data": [results[index] for index in sorted(results)],
+                "created": len(ids),
+                "failed": failed,
+            }
+            if not ids:
+                result["message"] = "No books were created"
+                return result, 400
+            return result, 207 if failed else 201
+        except Exception as e:
+            return {"success": False, "message": str(e)}, 500
+
     @staticmethod
     async def update(book_id, book_data):
         try:
             book = await BookRepository.get_by_id(book_id)
             if not book:
                 return {"success": False, "message": "Book not found"}, 404
-            if "author_id" in book_data:
-                author = await AuthorRepository.get_by_id(book_data["author_id"])
-                if not author:
+            isbn_changed = "isbn" in book_data and book_data["isbn"] != book.isbn
+            if "author_id" in book_data or "publisher_id" in book_data or isbn_changed:
+                checks = await BookRepository.check_references(
+                    author_id=book_data.get("author_id"),
+                    publisher_id=book_data.get("publisher_id"),
+                    isbn=book_data["isbn"] if isbn_changed else None,
+                )
+                if "author_id" in book_data and not checks.author_exists:
                     return {"success": False, "message": "Author not found"}, 404
-                book.author_id = book_data["author_id"]
-            if "publisher_id" in book_data:
-                publisher = await PublisherRepository.get_by_id(book_data["publisher_id"])
-                if not publisher:
+                if "publisher_id" in book_data and not checks.publisher_exists:
                     return {"success": False, "message": "Publisher not found"}, 404
-                book.publisher_id = book_data["publisher_id"]
-            if "isbn" in book_data and book_data["isbn"] != book.isbn:
-                existing_book = await BookRepository.get_by_isbn(book_data["isbn"])
-                if existing_book:
+                if checks.isbn_taken:
                     return {"success": False, "message": "ISBN already exists"}, 400
-                book.isbn = book_data["isbn"]
-            if "title" in book_data:
-                book.title = book_data["title"]
-            if "publication_date" in book_data:
-                book.publication_date = book_data["publication_date"]
-            if "price" in book_data:
-                book.price = book_data["price"]
-            if "description" in book_data:
-                book.description = book_data["description"]
-            await BookRepository.update(book)
-            # Re-fetch with author and publisher eagerly loaded
-            book = await BookRepository.get_by_id(book.id)
+            changes = {
+                field: book_data[field]
+                for field in (
+                    "title",
+                    "publication_date",
+                    "price",
+                    "description",
+                    "author_id",
+                    "publisher_id",
+                )
+                if field in book_data
+            }
+            if isbn_changed:
+                changes["isbn"] = book_data["isbn"]
+            if changes:
+                owners = [("author", book.author_id), ("publisher", book.publisher_id)]
+                book = await BookRepository.update(book_id, changes)
+                if not book:
+                    return {"success": False, "message": "Book not found"}, 404
+                # Drops the book and the author/publisher entries previewing it;
+                # a moved book also changes both owners' counts
+                invalidate(("book", book_id))
+                discard(
+                    *owners, ("author", book.author_id), ("publisher", book.publisher_id)
+                )
+                bump_generation("books")
             return {
                 "success": True,
                 "data": book,
@@ -112,62 +263,74 @@ class BookService:
             if not book:
                 return {"success": False, "message": "Book not found"}, 404
             await BookRepository.delete(book)
+            invalidate(("book", book_id))
+            discard(("author", book.author_id), ("publisher", book.publisher_id))
+            bump_generation("books")
             return {"success": True, "message": "Book deleted successfully"}, 200
         except Exception as e:
             return {"success": False, "message": str(e)}, 500
 
     @staticmethod
-    async def search_by_title(title, page=1, per_page=10):
+    async def search_by_title(title, page=1, per_page=10, fields=None, columns=False):
         try:
-            books = await BookRepository.search_by_title(title, page, per_page)
-            return {
+            pagination = await BookRepository.search_by_title(
+                title, page, per_page, fields=fields, columns=columns
+            )
+            result = {
                 "success": True,
-                "data": books,
+                "data": pagination.items,
                 "pagination": {
-                    "page": page,
-                    "per_page": per_page,
-                    "total": len(books),
-                    "pages": 1,
+                    "page": pagination.page,
+                    "per_page": pagination.per_page,
+                    "total": pagination.total,
+                    "pages": pagination.pages,
                 },
-            }, 200
+            }
+            if columns:
+                result["columns"] = pagination.columns
+            return result, 200
         except Exception as e:
             return {"success": False, "message": str(e)}, 500
 
     @staticmethod
-    async def get_by_author(author_id, page=1, per_page=10):
+    async def get_by_author(author_id, page=1, per_page=10, fields=None):
         try:
             author = await AuthorRepository.get_by_id(author_id)
             if not author:
                 return {"success": False, "message": "Author not found"}, 404
-            books = await BookRepository.get_by_author(author_id, page, per_page)
+            pagination = await BookRepository.get_by_author(
+                author_id, page, per_page, fields=fields
+            )
             return {
                 "success": True,
-                "data": books,
+                "data": pagination.items,
                 "pagination": {
-                    "page": page,
-                    "per_page": per_page,
-                    "total": len(books),
-                    "pages": 1,
+                    "page": pagination.page,
+                    "per_page": pagination.per_page,
+                    "total": pagination.total,
+                    "pages": pagination.pages,
                 },
             }, 200
         except Exception as e:
             return {"success": False, "message": str(e)}, 500
 
     @staticmethod
-    async def get_by_publisher(publisher_id, page=1, per_page=10):
+    async def get_by_publisher(publisher_id, page=1, per_page=10, fields=None):
         try:
             publisher = await PublisherRepository.get_by_id(publisher_id)
             if not publisher:
                 return {"success": False, "message": "Publisher not found"}, 404
-            books = await BookRepository.get_by_publisher(publisher_id, page, per_page)
+            pagination = await BookRepository.get_by_publisher(
+                publisher_id, page, per_page, fields=fields
+            )
             return {
                 "success": True,
-                "data": books,
+                "data": pagination.items,
                 "pagination": {
-                    "page": page,
-                    "per_page": per_page,
-                    "total": len(books),
-                    "pages": 1,
+                    "page": pagination.page,
+                    "per_page": pagination.per_page,
+                    "total": pagination.total,
+                    "pages": pagination.pages,
                 },
             }, 200
         except Exception as e:
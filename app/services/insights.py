@@ -1,21 +1,20 @@
 from app.repositories.insights_repository import InsightsRepository
 from app.repositories.book_repository import BookRepository
-from app.models.insights import Insight
 
 
 class InsightService:
     @staticmethod
     async def get_all(page=1, per_page=10):
         try:
-            insights = await InsightsRepository.get_all(page, per_page)
+            pagination = await InsightsRepository.get_all(page, per_page)
             return {
                 "success": True,
-                "data": insights,
+                "data": pagination.items,
                 "pagination": {
-                    "page": page,
-                    "per_page": per_page,
-                    "total": len(insights),
-                    "pages": 1,
+                    "page": pagination.page,
+                    "per_page": pagination.per_page,
+                    "total": pagination.total,
+                    "pages": pagination.pages,
                 },
             }, 200
         except Exception as e:
@@ -37,14 +36,13 @@ class InsightService:
             book = await BookRepository.get_by_id(data["book_id"])
             if not book:
                 return {"success": False, "message": "Book not found"}, 404
-            insight = Insight(
-                title=data.get("title"),
-                description=data.get("description"),
-                book_id=data.get("book_id"),
+            insight = await InsightsRepository.create(
+                {
+                    "title": data.get("title"),
+                    "description": data.get("description"),
+                    "book_id": data.get("book_id"),
+                }
             )
-            await InsightsRepository.create(insight)
-            # Re-fetch with book eagerly loaded
-            insight = await InsightsRepository.get_by_id(insight.id)
             return {"success": True, "data": insight}, 201
         except Exception as e:
             return {"success": False, "message": str(e)}, 500
@@ -59,14 +57,15 @@ class InsightService:
                 book = await BookRepository.get_by_id(data["book_id"])
                 if not book:
                     return {"success": False, "message": "Book not found"}, 404
-                insight.book_id = data["book_id"]
-            if "title" in data:
-                insight.title = data["title"]
-            if "description" in data:
-                insight.description = data["description"]
-            await InsightsRepository.update(insight)
-            # Re-fetch with book eagerly loaded
-            insight = await InsightsRepository.get_by_id(insight.id)
+            changes = {
+                field: data[field]
+                for field in ("title", "description", "book_id")
+                if field in data
+            }
+            if changes:
+                insight = await InsightsRepository.update(insight_id, changes)
+                if not insight:
+                    return {"success": False, "message": "Insight not found"}, 404
             return {"success": True, "data": insight}, 200
         except Exception as e:
             return {"success": False, "message": str(e)}, 500
@@ -1,25 +1,60 @@
 from app.repositories.publisher_repository import PublisherRepository
-from app.models.publisher import Publisher
+from app.repositories.pagination import encode_cursor, decode_cursor
+from app.cache import bump_generation, discard, invalidate
 
 
 class PublisherService:
     @staticmethod
-    async def get_all(page=1, per_page=10):
+    async def get_all(page=1, per_page=10, fields=None):
         try:
-            publishers = await PublisherRepository.get_all(page, per_page)
+            pagination = await PublisherRepository.get_all(
+                page, per_page, fields=fields
+            )
+            return {
+                "success": True,
+                "data": pagination.items,
+                "pagination": {
+                    "page": pagination.page,
+                    "per_page": pagination.per_page,
+                    "total": pagination.total,
+                    "pages": pagination.pages,
+                },
+            }, 200
+        except Exception as e:
+            return {"success": False, "message": str(e)}, 500
+
+    @staticmethod
+    async def get_all_after(cursor=None, per_page=10, fields=None, name=None):
+        try:
+            after = decode_cursor(cursor, "publishers") if cursor else None
+        except ValueError as e:
+            return {"success": False, "message": str(e)}, 400
+        try:
+            pagination = await PublisherRepository.get_all_after(
+                after, per_page, fields=fields, name=name
+            )
+            next_cursor = None
+            if pagination.next_key is not None:
+                next_cursor = encode_cursor(pagination.next_key, "publishers")
             return {
                 "success": True,
-                "data": publishers,
+                "data": pagination.items,
                 "pagination": {
-                    "page": page,
-                    "per_page": per_page,
-                    "total": len(publishers),
-                    "pages": 1,
+                    "per_page": pagination.per_page,
+                    "next_cursor": next_cursor,
                 },
             }, 200
         except Exception as e:
             return {"success": False, "message": str(e)}, 500
 
+    @staticmethod
+    async def export(batch_size=1000):
+        # Rows are only read as the response streams them, in its own context
+        return {
+            "success": True,
+            "data": PublisherRepository.stream_all(batch_size),
+        }, 200
+
     @staticmethod
     async def get_by_id(publisher_id):
         try:
@@ -33,13 +68,15 @@ class PublisherService:
     @staticmethod
     async def create(publisher_data):
         try:
-            publisher = Publisher(
-                name=publisher_data.get("name"),
-                founding_year=publisher_data.get("founding_year"),
-                website=publisher_data.get("website"),
+            publisher = await PublisherRepository.create(
+                {
+                    "name": publisher_data.get("name"),
+                    "founding_year": publisher_data.get("founding_year"),
+                    "website": publisher_data.get("website"),
+                }
             )
-            await PublisherRepository.create(publisher)
-            publisher = await PublisherRepository.get_by_id(publisher.id)
+            discard(("publisher", publisher.id))
+            bump_generation("publishers")
             return {
                 "success": True,
                 "data": publisher,
@@ -54,14 +91,15 @@ class PublisherService:
             publisher = await PublisherRepository.get_by_id(publisher_id)
             if not publisher:
                 return {"success": False, "message": "Publisher not found"}, 404
-            if "name" in publisher_data:
-                publisher.name = publisher_data["name"]
-            if "founding_year" in publisher_data:
-                publisher.founding_year = publisher_data["founding_year"]
-            if "website" in publisher_data:
-                publisher.website = publisher_data["website"]
-            await PublisherRepository.update(publisher)
-            publisher = await PublisherRepository.get_by_id(publisher.id)
+            changes = {
+                field: publisher_data[field]
+                for field in ("name", "founding_year", "website")
+                if field in publisher_data
+            }
+            if changes:
+                publisher = await PublisherRepository.update(publisher, changes)
+                invalidate(("publisher", publisher_id))
+                bump_generation("publishers")
             return {
                 "success": True,
                 "data": publisher,
@@ -77,22 +115,27 @@ class PublisherService:
             if not publisher:
                 return {"success": False, "message": "Publisher not found"}, 404
             await PublisherRepository.delete(publisher)
+            # Also drops the cached books that embedded this publisher
+            invalidate(("publisher", publisher_id))
+            bump_generation("publishers", "books")
             return {"success": True, "message": "Publisher deleted successfully"}, 200
         except Exception as e:
             return {"success": False, "message": str(e)}, 500
 
     @staticmethod
-    async def search_by_name(name, page=1, per_page=10):
+    async def search_by_name(name, page=1, per_page=10, fields=None):
         try:
-            publishers = await PublisherRepository.search_by_name(name, page, per_page)
+            pagination = await PublisherRepository.search_by_name(
+                name, page, per_page, fields=fields
+            )
             return {
                 "success": True,
-                "data": publishers,
+                "data": pagination.items,
                 "pagination": {
-                    "page": page,
-                    "per_page": per_page,
-                    "total": len(publishers),
-                    "pages": 1,
+                    "page": pagination.page,
+                    "per_page": pagination.per_page,
+                    "total": pagination.total,
+                    "pages": pagination.pages,
                 },
             }, 200
         except Exception as e:
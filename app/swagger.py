@@ -1,16 +1,58 @@
-from flask import Blueprint, jsonify, Response
+from quart import Blueprint, current_app, jsonify, request, Response
+import gzip
+import hashlib
 import os
 import json
 
 swagger_bp = Blueprint("swagger", __name__)
 
+root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+swagger_file_path = os.path.join(root_dir, "swagger.yaml")
 
-@swagger_bp.route("/swagger.json")
-def swagger_json():
-    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    swagger_file_path = os.path.join(root_dir, "swagger.yaml")
+# Compiled once; in debug mode it is rebuilt whenever swagger.yaml changes
+_compiled_spec = None
+
+
+def compile_spec(path=swagger_file_path):
+    """Parse the YAML spec into JSON bytes, a gzip variant and an ETag."""
+    import yaml
+
+    mtime = os.stat(path).st_mtime_ns
+    with open(path, "r") as f:
+        spec = yaml.safe_load(f.read())
+    body = json.dumps(spec, separators=(",", ":")).encode()
+    return {
+        "mtime": mtime,
+        "body": body,
+        "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+        "etag": hashlib.blake2b(body, digest_size=16).hexdigest(),
+    }
+
+
+def get_compiled_spec():
+    global _compiled_spec
+    if _compiled_spec is None or (
+        current_app.debug
+        and os.stat(swagger_file_path).st_mtime_ns != _compiled_spec["mtime"]
+    ):
+        _compiled_spec = compile_spec()
+    return _compiled_spec
+
+
+@swagger_bp.before_app_serving
+async def precompile_spec():
+    try:
+        get_compiled_spec()
+    except Exception:
+        # Reported by swagger_json() when the spec is requested
+        pass
 
-    if not os.path.exists(swagger_file_path):
+
+@swagger_bp.route("/swagger.json")
+async def swagger_json():
+    try:
+        spec = get_compiled_spec()
+    except FileNotFoundError:
         return (
             jsonify(
                 {
@@ -20,18 +62,6 @@ def swagger_json():
             ),
             404,
         )
-
-    try:
-        import yaml
-
-        with open(swagger_file_path, "r") as f:
-            spec = yaml.safe_load(f.read())
-
-        response = Response(json.dumps(spec), mimetype="application/json")
-        response.headers["Access-Control-Allow-Origin"] = "*"
-        response.headers["Access-Control-Allow-Methods"] = "GET"
-        response.headers["Access-Control-Allow-Headers"] = "Content-Type"
-        return response
     except ImportError:
         return (
             jsonify(
@@ -50,9 +80,29 @@ def swagger_json():
             500,
         )
 
+    # Each encoding is a different representation, so it gets its own ETag
+    gzipped = request.accept_encodings["gzip"] > 0
+    etag = spec["etag"] + "-gzip" if gzipped else spec["etag"]
+    if request.if_none_match.contains(etag):
+        response = Response("", status=304)
+    elif gzipped:
+        response = Response(spec["gzip"], mimetype="application/json")
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = Response(spec["body"], mimetype="application/json")
+    response.set_etag(etag)
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["Cache-Control"] = (
+        "no-cache" if current_app.debug else "public, max-age=86400"
+    )
+    response.headers["Access-Control-Allow-Origin"] = "*"
+    response.headers["Access-Control-Allow-Methods"] = "GET"
+    response.headers["Access-Control-Allow-Headers"] = "Content-Type"
+    return response
+
 
 @swagger_bp.route("/swagger")
-def swagger_ui():
+async def swagger_ui():
     return """
     <!DOCTYPE html>
     <html lang="en">
@@ -0,0 +1,84 @@
+"""Books created per second, one POST each versus POST /api/books/bulk.
+
+Runs the app in-process against a temporary SQLite database:
+
+    python benchmarks/bulk_books.py --rows 5000 --single 200
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def book(prefix, i):
+    return {
+        "title": f"{prefix} {i}",
+        "isbn": f"{prefix}{i:012d}",
+        "price": "9.99",
+        "author_id": 1,
+        "publisher_id": 1,
+    }
+
+
+async def run(rows, single):
+    from app import create_app
+    from app.config import TestingConfig
+    from app.models import Base
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    TestingConfig.SQLALCHEMY_DATABASE_URI = "sqlite:///" + path
+    app = create_app("testing")
+    app.async_engine.echo = False
+    async with app.async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    client = app.test_client()
+    credentials = {"email": "bench@example.com", "password": "password123"}
+    await client.post("/api/auth/register", json={"username": "bench", **credentials})
+    response = await client.post("/api/auth/login", json=credentials)
+    token = (await response.get_json())["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    author = {"first_name": "Jane", "last_name": "Austen"}
+    await client.post("/api/authors/", json=author, headers=headers)
+    await client.post("/api/publishers/", json={"name": "Penguin"}, headers=headers)
+
+    start = time.perf_counter()
+    for i in range(single):
+        response = await client.post("/api/books/", json=book(1, i), headers=headers)
+        assert response.status_code == 201
+    single_rate = single / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    books = [book(2, i) for i in range(rows)]
+    response = await client.post("/api/books/bulk", json=books, headers=headers)
+    assert response.status_code == 201
+    bulk_rate = rows / (time.perf_counter() - start)
+
+    app.password_hasher.shutdown()
+    await app.async_engine.dispose()
+    os.remove(path)
+
+    print(f"single  {single_rate:10.0f} books/s  ({single} requests)")
+    print(
+        f"bulk    {bulk_rate:10.0f} books/s  ({rows} rows, {bulk_rate / single_rate:.0f}x)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--single", type=int, default=200)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    asyncio.run(run(args.rows, args.single))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Size and encoding rate of a book list page, as objects and as columns.
+
+python benchmarks/columnar.py --rows 100 --repeat 200
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quart import Quart
+from app.api.columnar import transpose
+from app.json_provider import FastJSONProvider
+from app.schemas.book import BookSchema
+from app.schemas.compiled import compile_schema
+from benchmarks.serializers import make_rows
+
+FIELDS = (
+    "author_id",
+    "created_at",
+    "id",
+    "isbn",
+    "price",
+    "publication_date",
+    "publisher_id",
+    "title",
+    "updated_at",
+)
+
+
+def objects(schema, books):
+    return {"success": True, "data": schema.dump(books)}
+
+
+def columns(rows):
+    return {"success": True, "columns": FIELDS, "data": transpose(FIELDS, rows)}
+
+
+def measure(encode, provider, repeat):
+    body = provider.dumpb(encode())
+    start = time.perf_counter()
+    for _ in range(repeat):
+        provider.dumpb(encode())
+    return len(body), repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    provider = FastJSONProvider(Quart(__name__))
+    books, _ = make_rows(args.rows)
+    # Objects are dumped from entities, columns from the rows of a plain select
+    schema = compile_schema(BookSchema(many=True, only=FIELDS), native=True)
+    rows = [tuple(getattr(book, name) for name in FIELDS) for book in books]
+    size, rate = measure(lambda: objects(schema, books), provider, args.repeat)
+    print(f"objects {size:10} bytes {rate:10.0f} pages/s")
+    columnar_size, columnar_rate = measure(lambda: columns(rows), provider, args.repeat)
+    print(
+        f"columns {columnar_size:10} bytes {columnar_rate:10.0f} pages/s"
+        f"  ({size / columnar_size:.1f}x smaller, {columnar_rate / rate:.1f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    main()
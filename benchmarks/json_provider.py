@@ -0,0 +1,59 @@
+"""Rows per second of list response encoding, from entities to JSON bytes.
+
+python benchmarks/json_provider.py --rows 100 --repeat 200
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quart import Quart
+from quart.json.provider import DefaultJSONProvider
+from app.json_provider import FastJSONProvider
+from app.schemas.author import AuthorSchema
+from app.schemas.book import BookSchema
+from app.schemas.compiled import compile_schema
+from benchmarks.serializers import make_rows
+
+
+def rows_per_second(schema, provider, rows, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        provider.dumps({"success": True, "data": schema.dump(rows)}).encode()
+    return len(rows) * repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    app = Quart(__name__)
+    default = DefaultJSONProvider(app)
+    stdlib = FastJSONProvider(app)
+    stdlib.accelerated = False
+    fast = FastJSONProvider(app)
+    books, authors = make_rows(args.rows)
+    for label, schema, rows in [
+        ("books", BookSchema(many=True), books),
+        ("authors", AuthorSchema(many=True), authors),
+    ]:
+        native = compile_schema(schema, native=True)
+        baseline = rows_per_second(compile_schema(schema), default, rows, args.repeat)
+        results = [("stdlib", rows_per_second(native, stdlib, rows, args.repeat))]
+        if fast.accelerated:
+            results.append(("orjson", rows_per_second(native, fast, rows, args.repeat)))
+        print(
+            f"{label:8} default {baseline:10.0f} rows/s"
+            + "".join(
+                f"  {name} {rate:10.0f} rows/s ({rate / baseline:.1f}x)"
+                for name, rate in results
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Login latency, throughput and event-loop lag under a burst of logins.
+
+Runs the app in-process against a temporary SQLite database:
+
+    python benchmarks/login.py --workers 0   # hash on the event loop
+    python benchmarks/login.py --workers 4   # hash on a 4-thread pool
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+async def measure_lag(samples, stop, interval=0.005):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(loop.time() - start - interval)
+
+
+async def run(requests, concurrency, workers):
+    from app import create_app
+    from app.config import TestingConfig
+    from app.models import Base
+
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    TestingConfig.SQLALCHEMY_DATABASE_URI = "sqlite:///" + path
+    TestingConfig.PASSWORD_HASH_WORKERS = workers
+    app = create_app("testing")
+    app.async_engine.echo = False
+    async with app.async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    client = app.test_client()
+    credentials = {"email": "bench@example.com", "password": "password123"}
+    await client.post("/api/auth/register", json={"username": "bench", **credentials})
+
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post("/api/auth/login", json=credentials)
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200
+
+    lag, stop = [], asyncio.Event()
+    lag_task = asyncio.create_task(measure_lag(lag, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*[login() for _ in range(requests)])
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await lag_task
+    app.password_hasher.shutdown()
+    await app.async_engine.dispose()
+    os.remove(path)
+
+    def ms(seconds):
+        return f"{seconds * 1000:.1f}ms"
+
+    latencies.sort()
+    print(f"workers={workers} requests={requests} concurrency={concurrency}")
+    print(f"  throughput  {requests / elapsed:.1f} logins/s")
+    print(
+        f"  latency     p50 {ms(statistics.median(latencies))}"
+        f"  p95 {ms(latencies[int(len(latencies) * 0.95) - 1])}"
+    )
+    print(f"  loop lag    mean {ms(statistics.mean(lag))}  max {ms(max(lag))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    asyncio.run(run(args.requests, args.concurrency, args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Rows per second of the compiled list serializers against marshmallow.
+
+python benchmarks/serializers.py --rows 100 --repeat 200
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models.author import Author
+from app.models.book import Book
+from app.models.publisher import Publisher
+from app.schemas.author import AuthorSchema
+from app.schemas.book import BookSchema
+from app.schemas.compiled import compile_schema
+
+
+def make_rows(count):
+    author = Author(id=1, first_name="Jane", last_name="Austen")
+    publisher = Publisher(id=1, name="Penguin")
+    books = [
+        Book(
+            id=i,
+            title=f"Book {i}",
+            isbn=f"{9780000000000 + i}",
+            publication_date=date(2001, 1, 1),
+            price=Decimal("9.99"),
+            author_id=1,
+            publisher_id=1,
+            created_at=datetime(2024, 1, 1),
+            updated_at=datetime(2024, 1, 1),
+            author=author,
+            publisher=publisher,
+        )
+        for i in range(count)
+    ]
+    authors = []
+    for i in range(count):
+        owner = Author(
+            id=i,
+            first_name="Jane",
+            last_name="Austen",
+            birth_date=date(1775, 12, 16),
+            created_at=datetime(2024, 1, 1),
+            updated_at=datetime(2024, 1, 1),
+        )
+        set_committed_value(owner, "books", books[:10])
+        owner.books_count = count
+        authors.append(owner)
+    return books, authors
+
+
+def rows_per_second(schema, rows, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        schema.dump(rows)
+    return len(rows) * repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    books, authors = make_rows(args.rows)
+    for label, schema, rows in [
+        ("books", BookSchema(many=True), books),
+        ("authors", AuthorSchema(many=True), authors),
+    ]:
+        slow = rows_per_second(schema, rows, args.repeat)
+        fast = rows_per_second(compile_schema(schema), rows, args.repeat)
+        print(
+            f"{label:8} marshmallow {slow:10.0f} rows/s"
+            f"  compiled {fast:10.0f} rows/s  ({fast / slow:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import asyncio
+import json
+from datetime import date
+from decimal import Decimal
+from quart import Quart
+from app.api.columnar import (
+    COLUMNAR_MIMETYPE,
+    columnar_response,
+    transpose,
+    wants_columns,
+)
+from app.json_provider import FastJSONProvider
+
+COLUMNS = ["id", "price", "publication_date", "author.last_name"]
+ROWS = [
+    (1, Decimal("9.90"), date(1815, 12, 23), "Austen"),
+    (2, None, None, None),
+]
+
+
+def in_request(call, headers=None, query_string=None):
+    async def run():
+        app = Quart(__name__)
+        app.json = FastJSONProvider(app)
+        async with app.test_request_context(
+            "/", headers=headers, query_string=query_string
+        ):
+            return call()
+
+    return asyncio.run(run())
+
+
+def respond(result, headers=None):
+    """The columnar response to ``result`` with its body read."""
+
+    async def run():
+        app = Quart(__name__)
+        app.json = FastJSONProvider(app)
+        async with app.test_request_context("/", headers=headers):
+            response = columnar_response(result, 200)
+            return response, await response.get_data()
+
+    return asyncio.run(run())
+
+
+def page(rows=ROWS):
+    return {
+        "success": True,
+        "data": list(rows),
+        "columns": COLUMNS,
+        "pagination": {"page": 1, "per_page": 10, "total": len(rows), "pages": 1},
+    }
+
+
+class TestWantsColumns:
+    def test_format_argument(self):
+        assert in_request(wants_columns, query_string={"format": "columns"})
+
+    def test_accept_header(self):
+        assert in_request(wants_columns, headers={"Accept": COLUMNAR_MIMETYPE})
+
+    def test_json_preferred(self):
+        for accept in (
+            "application/json",
+            "*/*",
+            f"application/json, {COLUMNAR_MIMETYPE};q=0.5",
+        ):
+            assert not in_request(wants_columns, headers={"Accept": accept})
+
+
+class TestTranspose:
+    def test_one_list_per_column(self):
+        assert transpose(["id", "title"], [(1, "Emma"), (2, "Persuasion")]) == {
+            "id": [1, 2],
+            "title": ["Emma", "Persuasion"],
+        }
+
+    def test_empty(self):
+        assert transpose(["id", "title"], []) == {"id": [], "title": []}
+
+
+class TestColumnarResponse:
+    def test_body(self):
+        response, body = respond(page())
+        assert response.mimetype == COLUMNAR_MIMETYPE
+        assert response.status_code == 200
+        assert json.loads(body) == {
+            "success": True,
+            "columns": COLUMNS,
+            "data": {
+                "id": [1, 2],
+                "price": ["9.90", None],
+                "publication_date": ["1815-12-23", None],
+                "author.last_name": ["Austen", None],
+            },
+            "pagination": {"page": 1, "per_page": 10, "total": 2, "pages": 1},
+        }
+
+    def test_not_modified(self):
+        response, _ = respond(page())
+        etag, _ = response.get_etag()
+        headers = {"If-None-Match": f'"{etag}"'}
+        response, body = respond(page(), headers)
+        assert response.status_code == 304
+        assert body == b""
+
+    def test_etag_follows_rows(self):
+        first, _ = respond(page())
+        second, _ = respond(page(ROWS[:1]))
+        assert first.get_etag() != second.get_etag()
+
+    def test_errors_are_plain_json(self):
+        response, status_code = in_request(
+            lambda: columnar_response({"success": False, "message": "Invalid"}, 400)
+        )
+        assert status_code == 400
+        assert response.mimetype == "application/json"
@@ -0,0 +1,93 @@
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+import pytest
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models.author import Author
+from app.models.book import Book
+from app.models.publisher import Publisher
+from app.schemas.author import AuthorSchema
+from app.schemas.book import BookSchema
+from app.schemas.compiled import compile_schema
+from app.schemas.publisher import PublisherSchema
+
+PRICES = [Decimal("9.99"), Decimal("10"), Decimal("1E+2"), Decimal("0.10"), None]
+
+
+def make_author(**overrides):
+    values = dict(
+        id=1,
+        first_name="Jane",
+        last_name="Austen",
+        biography="Novelist",
+        birth_date=date(1775, 12, 16),
+        created_at=datetime(2024, 1, 1, 12, 0, 0, 123456),
+        updated_at=datetime(2024, 1, 2, tzinfo=timezone.utc),
+    )
+    values.update(overrides)
+    return Author(**values)
+
+
+def make_book(index, author=None, publisher=None):
+    return Book(
+        id=index,
+        title=f"Book {index} – ü",
+        isbn=f"978000000000{index % 10}",
+        publication_date=date(2001, 1, 1 + index % 28) if index % 3 else None,
+        price=PRICES[index % len(PRICES)],
+        description=None if index % 2 else "Long description",
+        author_id=author.id if author else None,
+        publisher_id=publisher.id if publisher else None,
+        created_at=datetime(2024, 1, 1),
+        updated_at=datetime(2024, 1, 1, 8, 30),
+        author=author,
+        publisher=publisher,
+    )
+
+
+def with_previews(owner, books):
+    set_committed_value(owner, "books", books)
+    owner.books_count = len(books)
+    return owner
+
+
+def assert_same_json(schema, data):
+    expected = json.dumps(schema.dump(data), ensure_ascii=False)
+    actual = json.dumps(compile_schema(schema).dump(data), ensure_ascii=False)
+    assert actual == expected
+
+
+class TestCompiledSchemaParity:
+    @pytest.mark.parametrize("exclude", [(), ("description",)])
+    def test_book_list(self, exclude):
+        author = make_author()
+        publisher = Publisher(id=2, name="Penguin")
+        books = [make_book(i, author, publisher if i % 4 else None) for i in range(12)]
+        assert_same_json(BookSchema(many=True, exclude=exclude), books)
+
+    def test_single_book(self):
+        assert_same_json(BookSchema(), make_book(3, make_author()))
+
+    @pytest.mark.parametrize("exclude", [(), ("biography",)])
+    def test_author_list(self, exclude):
+        authors = [
+            with_previews(make_author(), [make_book(1), make_book(2)]),
+            with_previews(make_author(id=2, birth_date=None, biography=None), []),
+        ]
+        assert_same_json(AuthorSchema(many=True, exclude=exclude), authors)
+
+    def test_publisher_list(self):
+        publishers = [
+            with_previews(
+                Publisher(id=1, name="Penguin", founding_year=1935, website=None),
+                [make_book(4)],
+            )
+        ]
+        assert_same_json(PublisherSchema(many=True), publishers)
+
+    def test_missing_attribute_is_omitted(self):
+        # books_count is only set once previews have been loaded
+        assert_same_json(AuthorSchema(many=True), [make_author()])
+
+    def test_mappings_fall_back_to_marshmallow(self):
+        assert_same_json(BookSchema(), {"id": 1, "title": "Emma", "price": "9.5"})
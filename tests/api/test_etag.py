@@ -0,0 +1,65 @@
+from datetime import datetime
+from types import SimpleNamespace
+from app.api.etag import book_version, make_etag, owner_version
+
+
+def make_book(title="Emma", author_name="Jane"):
+    author = SimpleNamespace(id=1, first_name=author_name, last_name="Austen")
+    publisher = SimpleNamespace(id=1, name="Penguin")
+    return SimpleNamespace(
+        id=1,
+        title=title,
+        updated_at=datetime(2024, 1, 1),
+        author=author,
+        publisher=publisher,
+    )
+
+
+class TestMakeEtag:
+    def test_stable_for_same_data(self):
+        result = {"success": True, "data": make_book()}
+        assert make_etag(result, book_version) == make_etag(result, book_version)
+
+    def test_changes_with_embedded_author(self):
+        before = make_etag({"data": make_book()}, book_version)
+        after = make_etag({"data": make_book(author_name="Janet")}, book_version)
+        assert before != after
+
+    def test_changes_with_pagination(self):
+        data = [make_book()]
+        first = make_etag({"data": data, "pagination": {"total": 1}}, book_version)
+        second = make_etag({"data": data, "pagination": {"total": 2}}, book_version)
+        assert first != second
+
+    def test_owner_changes_with_preview_titles(self):
+        def owner(title):
+            return SimpleNamespace(
+                id=1,
+                updated_at=datetime(2024, 1, 1),
+                books_count=1,
+                books=[SimpleNamespace(id=1, title=title)],
+            )
+
+        before = make_etag({"data": owner("Emma")}, owner_version)
+        after = make_etag({"data": owner("Persuasion")}, owner_version)
+        assert before != after
+
+
+class TestMakeEtagFields:
+    def test_changes_with_fields(self):
+        result = {"data": [make_book()]}
+        assert make_etag(result, book_version, ("id",)) != make_etag(
+            result, book_version, ("id", "title")
+        )
+
+    def test_ignores_relations_not_requested(self):
+        fields = ("id", "title")
+        before = make_etag({"data": make_book()}, book_version, fields)
+        after = make_etag(
+            {"data": make_book(author_name="Janet")}, book_version, fields
+        )
+        assert before == after
+
+    def test_narrowed_book_reads_no_relations(self):
+        book = SimpleNamespace(id=1, updated_at=datetime(2024, 1, 1))
+        assert book_version(book, ("id",)) == (1, datetime(2024, 1, 1))
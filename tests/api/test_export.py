@@ -0,0 +1,56 @@
+import csv
+import io
+import json
+from collections import namedtuple
+from datetime import date, datetime
+from decimal import Decimal
+from app.api.export import csv_chunk, ndjson_chunk
+from app.json_provider import FastJSONProvider
+from quart import Quart
+
+Row = namedtuple("Row", ["id", "title", "price", "publication_date", "created_at"])
+
+ROWS = [
+    Row(1, "Emma, a novel", Decimal("1E+1"), date(1815, 12, 23), datetime(2024, 1, 1)),
+    Row(2, 'Say "ü"', None, None, datetime(2024, 1, 2, 8, 30, 0, 5)),
+]
+
+
+class TestNdjsonChunk:
+    def test_one_object_per_line(self):
+        app = Quart(__name__)
+        chunk = ndjson_chunk(ROWS, FastJSONProvider(app).dumpb)
+        lines = chunk.decode().splitlines()
+        assert chunk.endswith(b"\n")
+        assert [json.loads(line) for line in lines] == [
+            {
+                "id": 1,
+                "title": "Emma, a novel",
+                "price": "10",
+                "publication_date": "1815-12-23",
+                "created_at": "2024-01-01T00:00:00",
+            },
+            {
+                "id": 2,
+                "title": 'Say "ü"',
+                "price": None,
+                "publication_date": None,
+                "created_at": "2024-01-02T08:30:00.000005",
+            },
+        ]
+
+
+class TestCsvChunk:
+    def test_header_and_values(self):
+        chunk = csv_chunk(ROWS, header=True)
+        assert list(csv.reader(io.StringIO(chunk.decode()))) == [
+            ["id", "title", "price", "publication_date", "created_at"],
+            ["1", "Emma, a novel", "10", "1815-12-23", "2024-01-01T00:00:00"],
+            ["2", 'Say "ü"', "", "", "2024-01-02T08:30:00.000005"],
+        ]
+
+    def test_later_batches_have_no_header(self):
+        chunk = csv_chunk(ROWS[:1])
+        assert chunk.decode().splitlines() == [
+            '1,"Emma, a novel",10,1815-12-23,2024-01-01T00:00:00'
+        ]
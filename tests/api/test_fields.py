@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+from quart import Quart
+from app.api.fields import BOOK_RELATIONS, project, requested_fields
+from app.schemas.book import BookSchema
+from app.schemas.compiled import CompiledSchema, compile_schema
+from tests.api.test_compiled_schemas import make_author, make_book
+
+books_schema = compile_schema(
+    BookSchema(many=True, exclude=("description",)), native=True
+)
+
+
+def fields_for(query_string, schema=books_schema, relations=()):
+    async def run():
+        app = Quart(__name__)
+        async with app.test_request_context("/", query_string=query_string):
+            return requested_fields(schema, relations)
+
+    return asyncio.run(run())
+
+
+class TestRequestedFields:
+    def test_absent_or_empty_means_all(self):
+        assert fields_for({}) is None
+        assert fields_for({"fields": " , "}) is None
+
+    def test_sorted_and_deduplicated(self):
+        assert fields_for({"fields": "title, id,price,id"}) == ("id", "price", "title")
+
+    def test_unknown_fields(self):
+        with pytest.raises(ValueError, match="Unknown fields: description, nope"):
+            fields_for({"fields": "id,nope,description"})
+
+    def test_plain_schema(self):
+        assert fields_for({"fields": "description"}, BookSchema()) == ("description",)
+
+
+class TestInclude:
+    def test_relations_left_out_by_default(self):
+        fields = fields_for({}, relations=BOOK_RELATIONS)
+        assert "author_id" in fields
+        assert "author" not in fields
+        assert "publisher" not in fields
+
+    def test_include_adds_relations(self):
+        fields = fields_for({"include": "publisher"}, relations=BOOK_RELATIONS)
+        assert "publisher" in fields
+        assert "author" not in fields
+
+    def test_including_everything_dumps_all_fields(self):
+        query = {"include": "author,publisher"}
+        assert fields_for(query, relations=BOOK_RELATIONS) is None
+
+    def test_fields_can_name_relations(self):
+        query = {"fields": "id,author", "include": "publisher"}
+        assert fields_for(query, relations=BOOK_RELATIONS) == (
+            "author",
+            "id",
+            "publisher",
+        )
+
+    def test_unknown_includes(self):
+        with pytest.raises(ValueError, match="Unknown includes: insights"):
+            fields_for({"include": "author,insights"}, relations=BOOK_RELATIONS)
+        with pytest.raises(ValueError, match="Unknown includes: author"):
+            fields_for({"include": "author"})
+
+
+class TestProject:
+    def test_none_keeps_schema(self):
+        assert project(books_schema, None) is books_schema
+
+    def test_compiled_projection(self):
+        projected = project(books_schema, ("author", "id"))
+        assert isinstance(projected, CompiledSchema)
+        assert projected.native
+        assert projected is project(books_schema, ("author", "id"))
+        books = [make_book(1, make_author())]
+        assert projected.dump(books) == [
+            {"id": 1, "author": {"id": 1, "first_name": "Jane", "last_name": "Austen"}}
+        ]
+
+    def test_plain_projection_keeps_options(self):
+        projected = project(BookSchema(many=True, exclude=("description",)), ("id",))
+        assert projected.many
+        assert projected.dump([make_book(2)]) == [{"id": 2}]
@@ -0,0 +1,102 @@
+import asyncio
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+import pytest
+from quart import Quart
+from app import json_provider
+from app.json_provider import FastJSONProvider
+from app.models.publisher import Publisher
+from app.schemas.author import AuthorSchema
+from app.schemas.book import BookSchema
+from app.schemas.compiled import compile_schema
+from tests.api.test_compiled_schemas import make_author, make_book, with_previews
+
+ENCODERS = [
+    pytest.param(True, id="orjson"),
+    pytest.param(False, id="stdlib"),
+]
+
+
+@pytest.fixture
+def quart_app():
+    return Quart(__name__)
+
+
+@pytest.fixture(params=ENCODERS)
+def provider(request, quart_app):
+    if request.param and json_provider.orjson is None:
+        pytest.skip("orjson is not installed")
+    provider = FastJSONProvider(quart_app)
+    provider.accelerated = request.param
+    return provider
+
+
+def marshmallow_json(schema, data):
+    return json.dumps(
+        schema.dump(data), ensure_ascii=False, sort_keys=True, separators=(",", ":")
+    ).encode()
+
+
+class TestFastJSONProvider:
+    def test_native_values(self, provider):
+        data = {
+            "price": Decimal("1E+2"),
+            "cents": Decimal("0.10"),
+            "day": date(2001, 2, 3),
+            "naive": datetime(2024, 1, 1, 12, 0, 0, 123456),
+            "aware": datetime(2024, 1, 2, tzinfo=timezone.utc),
+        }
+        assert json.loads(provider.dumpb(data)) == {
+            "aware": "2024-01-02T00:00:00+00:00",
+            "cents": "0.10",
+            "day": "2001-02-03",
+            "naive": "2024-01-01T12:00:00.123456",
+            "price": "100",
+        }
+
+    def test_sorted_compact_utf8(self, provider):
+        assert provider.dumpb({"b": "ü", "a": [1, None]}) == (
+            '{"a":[1,null],"b":"ü"}'.encode()
+        )
+        assert provider.dumps({"b": 1, "a": 2}) == '{"a":2,"b":1}'
+
+    def test_indent(self, provider):
+        assert provider.dumpb({"a": [1]}, indent=True) == b'{\n  "a": [\n    1\n  ]\n}'
+
+    def test_integers_beyond_64_bits(self, provider):
+        assert provider.dumpb({"n": 2**70}) == b'{"n":1180591620717411303424}'
+
+    def test_unsupported_type(self, provider):
+        with pytest.raises(TypeError):
+            provider.dumpb({"value": object()})
+
+    def test_loads(self, provider):
+        assert provider.loads(b'{"a": [1, "\xc3\xbc"]}') == {"a": [1, "ü"]}
+
+    def test_response(self, provider, quart_app):
+        async def run():
+            async with quart_app.app_context():
+                response = provider.response({"price": Decimal("9.99")})
+                return response.mimetype, await response.get_data()
+
+        assert asyncio.run(run()) == ("application/json", b'{"price":"9.99"}\n')
+
+    def test_native_books_match_marshmallow(self, provider):
+        author = make_author()
+        publisher = Publisher(id=2, name="Penguin")
+        books = [make_book(i, author, publisher if i % 4 else None) for i in range(12)]
+        schema = BookSchema(many=True, exclude=("description",))
+        native = compile_schema(schema, native=True).dump(books)
+        assert isinstance(native[1]["price"], Decimal)
+        assert provider.dumpb(native) == marshmallow_json(schema, books)
+
+    def test_native_authors_match_marshmallow(self, provider):
+        authors = [
+            with_previews(make_author(), [make_book(1), make_book(2)]),
+            with_previews(make_author(id=2, birth_date=None, biography=None), []),
+        ]
+        schema = AuthorSchema(many=True, exclude=("biography",))
+        native = compile_schema(schema, native=True).dump(authors)
+        assert isinstance(native[0]["birth_date"], date)
+        assert provider.dumpb(native) == marshmallow_json(schema, authors)
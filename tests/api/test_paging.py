@@ -0,0 +1,29 @@
+import asyncio
+import pytest
+from quart import Quart
+from app.api.paging import per_page_arg
+
+
+def per_page_for(query_string, max_per_page=100):
+    async def run():
+        app = Quart(__name__)
+        app.config["MAX_PER_PAGE"] = max_per_page
+        async with app.test_request_context("/", query_string=query_string):
+            return per_page_arg()
+
+    return asyncio.run(run())
+
+
+class TestPerPageArg:
+    @pytest.mark.parametrize(
+        "value, expected",
+        [("25", 25), ("0", 1), ("-1", 1), ("1000", 100), ("ten", 10)],
+    )
+    def test_clamped(self, value, expected):
+        assert per_page_for({"per_page": value}) == expected
+
+    def test_default(self):
+        assert per_page_for({}) == 10
+
+    def test_configured_maximum(self):
+        assert per_page_for({"per_page": "50"}, max_per_page=20) == 20
@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.models import Author, Base, Book, Publisher
+
+
+@pytest.fixture
+def client(app, tmp_path):
+    """A client over five books by author 1 at publisher 1, and one by 2 at 2."""
+    app.config["NESTED_BOOKS_LIMIT"] = 2
+    app.config["RESPONSE_CACHE_ENABLED"] = False
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+    app.async_engine = engine
+    app.async_session = sessionmaker(
+        engine, expire_on_commit=False, class_=AsyncSession
+    )
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(
+                insert(Author),
+                [
+                    {"first_name": "Jane", "last_name": "Austen"},
+                    {"first_name": "Mary", "last_name": "Shelley"},
+                ],
+            )
+            await conn.execute(
+                insert(Publisher), [{"name": "Penguin"}, {"name": "Vintage"}]
+            )
+            await conn.execute(
+                insert(Book),
+                [
+                    {"title": f"Book {i}", "author_id": 1, "publisher_id": 1}
+                    for i in range(1, 6)
+                ]
+                + [{"title": "Frankenstein", "author_id": 2, "publisher_id": 2}],
+            )
+
+    asyncio.run(setup())
+    yield app.test_client()
+    asyncio.run(engine.dispose())
+
+
+def get_json(client, url):
+    async def get():
+        response = await client.get(url)
+        return response.status_code, await response.get_json()
+
+    return asyncio.run(get())
+
+
+@pytest.mark.parametrize("owners", ["authors", "publishers"])
+class TestPreviews:
+    def test_detail_caps_books_and_counts_all(self, client, owners):
+        status_code, body = get_json(client, f"/api/{owners}/1")
+        assert status_code == 200
+        assert [book["title"] for book in body["data"]["books"]] == ["Book 1", "Book 2"]
+        assert body["data"]["books_count"] == 5
+
+    def test_list_caps_books_per_owner(self, client, owners):
+        status_code, body = get_json(client, f"/api/{owners}")
+        assert status_code == 200
+        assert [
+            (len(owner["books"]), owner["books_count"]) for owner in body["data"]
+        ] == [(2, 5), (1, 1)]
+
+    def test_owner_books_paginate(self, client, owners):
+        status_code, body = get_json(client, f"/api/{owners}/1/books?per_page=2&page=3")
+        assert status_code == 200
+        assert [book["title"] for book in body["data"]] == ["Book 5"]
+        assert body["pagination"] == {"page": 3, "per_page": 2, "total": 5, "pages": 3}
+
+    def test_owner_books_first_page(self, client, owners):
+        _, body = get_json(client, f"/api/{owners}/1/books?per_page=2")
+        assert [book["title"] for book in body["data"]] == ["Book 1", "Book 2"]
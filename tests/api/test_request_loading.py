@@ -0,0 +1,52 @@
+from datetime import date
+from decimal import Decimal
+import pytest
+from marshmallow import ValidationError
+from app.api.authors import author_schema
+from app.api.books import book_schema
+from app.api.publishers import publisher_schema
+
+
+class TestRequestLoading:
+    def test_book_values_are_typed(self):
+        data = book_schema.load(
+            {
+                "title": "Emma",
+                "isbn": "9780141439587",
+                "publication_date": "1815-12-23",
+                "price": "9.99",
+                "author_id": "1",
+                "publisher_id": 2,
+            }
+        )
+        assert data["publication_date"] == date(1815, 12, 23)
+        assert data["price"] == Decimal("9.99")
+        assert data["author_id"] == 1
+
+    def test_partial_update_keeps_only_sent_fields(self):
+        data = book_schema.load({"price": 7}, partial=True)
+        assert data == {"price": Decimal("7")}
+
+    def test_author_and_publisher_values_are_typed(self):
+        author = author_schema.load(
+            {"first_name": "Leo", "last_name": "Tolstoy", "birth_date": "1828-09-09"}
+        )
+        assert author["birth_date"] == date(1828, 9, 9)
+        publisher = publisher_schema.load({"name": "Viking", "founding_year": "1925"})
+        assert publisher["founding_year"] == 1925
+
+    def test_errors_cover_every_field(self):
+        with pytest.raises(ValidationError) as err:
+            book_schema.load({"title": "", "price": "abc", "bogus": 1})
+        assert set(err.value.messages) == {
+            "title",
+            "price",
+            "author_id",
+            "publisher_id",
+            "bogus",
+        }
+
+    def test_dump_only_fields_are_rejected(self):
+        with pytest.raises(ValidationError) as err:
+            publisher_schema.load({"name": "Viking", "id": 3}, partial=True)
+        assert "id" in err.value.messages
@@ -0,0 +1,13 @@
+import gzip
+import json
+from app.swagger import compile_spec
+
+
+class TestCompileSpec:
+    def test_gzip_variant_matches_body(self):
+        spec = compile_spec()
+        assert gzip.decompress(spec["gzip"]) == spec["body"]
+        assert "paths" in json.loads(spec["body"])
+
+    def test_etag_is_stable(self):
+        assert compile_spec()["etag"] == compile_spec()["etag"]
@@ -0,0 +1,155 @@
+import asyncio
+from unittest.mock import patch
+import pytest
+from quart import g
+from quart_jwt_extended import create_access_token
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.future import select
+from sqlalchemy.orm import sessionmaker
+from werkzeug.datastructures import MultiDict
+from app import extensions
+from app.cache import bump_generation
+from app.models import Author, Base, Book, Publisher
+
+
+@pytest.fixture
+def client(app, tmp_path):
+    """A client whose requests share an on-disk database with one book."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+    app.async_engine = engine
+    app.async_session = sessionmaker(
+        engine, expire_on_commit=False, class_=AsyncSession
+    )
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(
+                insert(Author), [{"first_name": "Jane", "last_name": "Austen"}]
+            )
+            await conn.execute(insert(Publisher), [{"name": "Penguin"}])
+            await conn.execute(
+                insert(Book), [{"title": "Emma", "author_id": 1, "publisher_id": 1}]
+            )
+
+    asyncio.run(setup())
+    yield app.test_client()
+    asyncio.run(engine.dispose())
+
+
+def run(app, call):
+    async def main():
+        headers = {}
+        async with app.app_context():
+            headers["Authorization"] = f"Bearer {create_access_token(identity=1)}"
+        return await call(headers)
+
+    return asyncio.run(main())
+
+
+def stored_titles(app):
+    async def read():
+        async with app.async_session() as session:
+            return list(await session.scalars(select(Book.title).order_by(Book.id)))
+
+    return asyncio.run(read())
+
+
+class TestRequestTransaction:
+    def test_successful_write_is_committed(self, app, client):
+        async def call(headers):
+            return await client.put(
+                "/api/books/1", json={"title": "Persuasion"}, headers=headers
+            )
+
+        assert run(app, call).status_code == 200
+        assert stored_titles(app) == ["Persuasion"]
+
+    def test_error_response_rolls_back_flushed_writes(self, app, client):
+        # The UPDATE has already run when the service fails
+        async def call(headers):
+            with patch(
+                "app.services.book_service.invalidate", side_effect=Exception("boom")
+            ):
+                return await client.put(
+                    "/api/books/1", json={"title": "Persuasion"}, headers=headers
+                )
+
+        response = run(app, call)
+        assert response.status_code == 500
+        assert stored_titles(app) == ["Emma"]
+
+    def test_raised_exception_rolls_back_flushed_writes(self, app, client):
+        async def call(headers):
+            with patch(
+                "app.api.books.book_schema.dump", side_effect=RuntimeError("boom")
+            ):
+                return await client.put(
+                    "/api/books/1", json={"title": "Persuasion"}, headers=headers
+                )
+
+        with pytest.raises(RuntimeError):
+            run(app, call)
+        assert stored_titles(app) == ["Emma"]
+
+
+class TestHasWrites:
+    def test_set_by_write_statements_only(self, app, client):
+        async def call():
+            async with app.app_context():
+                session = extensions.get_session()
+                await session.execute(select(Book))
+                read_only = session.info.get("has_writes", False)
+                await session.execute(update(Book).values(title="Persuasion"))
+                return read_only, session.info.get("has_writes")
+
+        assert asyncio.run(call()) == (False, True)
+
+
+class TestQueuedInvalidations:
+    def spy(self, calls):
+        replay = extensions.replay_invalidations
+
+        def replay_after_commit():
+            calls.append((g.db_session.in_transaction(), g.get("stale_tables")))
+            replay()
+
+        return patch("app.extensions.replay_invalidations", replay_after_commit)
+
+    def generation(self, app):
+        key = app.response_cache.key("/api/books", MultiDict(), ("books",))
+        return key[-1][0]
+
+    def test_replayed_after_commit(self, app, client):
+        calls = []
+
+        async def call(headers):
+            with self.spy(calls):
+                return await client.put(
+                    "/api/books/1", json={"title": "Persuasion"}, headers=headers
+                )
+
+        assert run(app, call).status_code == 200
+        assert calls == [(False, ["books"])]
+        # Bumped when queued, and again once committed
+        assert self.generation(app) == 2
+
+    def test_dropped_on_rollback(self, app, client):
+        calls = []
+
+        def bump_then_fail(*tables):
+            bump_generation(*tables)
+            raise Exception("boom")
+
+        async def call(headers):
+            with self.spy(calls), patch(
+                "app.services.book_service.bump_generation", bump_then_fail
+            ):
+                return await client.put(
+                    "/api/books/1", json={"title": "Persuasion"}, headers=headers
+                )
+
+        assert run(app, call).status_code == 500
+        assert calls == []
+        assert self.generation(app) == 1
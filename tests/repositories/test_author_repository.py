@@ -1,7 +1,11 @@
+import asyncio
+from unittest.mock import patch
 import pytest
 from app.repositories.author_repository import AuthorRepository
-from app.models.author import Author
+from app.models.author import Author, normalize_name
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from app.models import Base
 
 
 class TestAuthorRepository:
@@ -131,3 +135,66 @@ class TestAuthorRepository:
         # Test with no match
         result = AuthorRepository.search_by_name("XYZ", page=1, per_page=10)
         assert len(result.items) == 0
+
+
+class TestNormalizeName:
+    def test_lowercases_and_folds_accents(self):
+        assert normalize_name("Émile  ZOLA") == "emile zola"
+
+    def test_collapses_whitespace(self):
+        assert normalize_name("  Jane \t Austen ") == "jane austen"
+
+    def test_none(self):
+        assert normalize_name(None) == ""
+
+
+def seek_all(model, rows, module, call):
+    """Add ``rows`` of ``model`` and collect every page ``call(after)`` seeks."""
+
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as session:
+            session.add_all(model(**values) for values in rows)
+            await session.flush()
+            with patch(f"{module}.get_session", return_value=session):
+                items = []
+                after = None
+                while True:
+                    page = await call(after)
+                    items += page.items
+                    if page.next_key is None:
+                        break
+                    after = page.next_key
+        await engine.dispose()
+        return items
+
+    return asyncio.run(run())
+
+
+class TestFilteredSeek:
+    def test_cursor_seeks_within_name_filter(self, app):
+        rows = [
+            {"first_name": first, "last_name": last}
+            for first, last in [
+                ("John", "Doe"),
+                ("Jane", "Smith"),
+                ("John", "Smith"),
+                ("Jane", "Doe"),
+                ("Johanna", "Adams"),
+            ]
+        ]
+
+        async def call(after):
+            async with app.app_context():
+                return await AuthorRepository.get_all_after(
+                    after, per_page=1, name="jo"
+                )
+
+        authors = seek_all(Author, rows, "app.repositories.author_repository", call)
+        assert [(a.first_name, a.last_name) for a in authors] == [
+            ("Johanna", "Adams"),
+            ("John", "Doe"),
+            ("John", "Smith"),
+        ]
@@ -1,8 +1,14 @@
+import asyncio
 from decimal import Decimal
+from unittest.mock import patch
 import pytest
-from app.repositories.book_repository import BookRepository
+from app.repositories.book_repository import BookRepository, _list_select
 from app.models.book import Book
+from sqlalchemy import insert, inspect
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.future import select
+from app.models import Author, Base, Publisher
 import datetime
 
 
@@ -193,3 +199,215 @@ class TestBookRepository:
         assert result.items is not None
         assert len(result.items) == 4  # 3 new books + 1 sample book
         assert all(book.publisher_id == sample_publisher.id for book in result.items)
+
+
+class TestColumnarSelect:
+    def test_plain_columns_labelled_by_field(self):
+        stmt = _list_select(("id", "price", "title"), True)
+        assert [column.key for column in stmt.selected_columns] == [
+            "id",
+            "price",
+            "title",
+        ]
+        assert "JOIN" not in str(stmt)
+
+    def test_included_relations_are_joined_and_flattened(self):
+        stmt = _list_select(("author", "id"), True, "title", "id")
+        assert [column.key for column in stmt.selected_columns] == [
+            "id",
+            "title",
+            "author.id",
+            "author.first_name",
+            "author.last_name",
+        ]
+        assert "LEFT OUTER JOIN authors" in str(stmt)
+
+
+def run_seeded(call):
+    """Run ``call(session)`` against a fresh database with author and publisher 1."""
+
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(
+                insert(Author), [{"first_name": "Jane", "last_name": "Austen"}]
+            )
+            await conn.execute(insert(Publisher), [{"name": "Penguin"}])
+        async with AsyncSession(engine) as session:
+            with patch(
+                "app.repositories.book_repository.get_session", return_value=session
+            ):
+                result = await call(session)
+        await engine.dispose()
+        return result
+
+    return asyncio.run(run())
+
+
+class TestBulk:
+    def run(self, call):
+        return run_seeded(call)
+
+    def test_find_references_in_batches(self):
+        async def call(session):
+            await BookRepository.create_many(
+                [
+                    {
+                        "title": "Emma",
+                        "isbn": "9780141439587",
+                        "author_id": 1,
+                        "publisher_id": 1,
+                    }
+                ]
+            )
+            return await BookRepository.find_references(
+                {1, 2, 3}, {1, 2}, {"9780141439587", "9780000000000"}, batch_size=2
+            )
+
+        assert self.run(call) == ({1}, {1}, {"9780141439587"})
+
+    def test_create_many_returns_ids_in_row_order(self):
+        rows = [
+            {"title": f"Book {i}", "author_id": 1, "publisher_id": 1} for i in range(25)
+        ]
+
+        async def call(session):
+            ids = await BookRepository.create_many(rows, batch_size=10)
+            titles = dict((await session.execute(select(Book.id, Book.title))).all())
+            return [titles[book_id] for book_id in ids]
+
+        assert self.run(call) == [row["title"] for row in rows]
+
+
+class TestSearch:
+    def add(self, session, *books):
+        session.add_all(Book(author_id=1, publisher_id=1, **values) for values in books)
+        return session.flush()
+
+    def test_cursor_seeks_within_title_filter(self, app):
+        async def call(session):
+            await self.add(
+                session,
+                {"title": "Emma"},
+                {"title": "Persuasion", "description": "Emma is mentioned"},
+                {"title": "Mansfield Park"},
+                {"title": "Emma, a sequel"},
+            )
+            titles = []
+            after = None
+            async with app.app_context():
+                while True:
+                    page = await BookRepository.get_all_after(
+                        after, per_page=2, title="emma"
+                    )
+                    titles += [book.title for book in page.items]
+                    if page.next_key is None:
+                        return titles
+                    after = page.next_key
+
+        assert run_seeded(call) == ["Emma", "Emma, a sequel", "Persuasion"]
+
+    def search(self, app, title):
+        async def titles():
+            async with app.app_context():
+                page = await BookRepository.search_by_title(title)
+                return [book.title for book in page.items]
+
+        return titles()
+
+    def test_search_follows_updates(self, app):
+        async def call(session):
+            await self.add(session, {"title": "Emma"})
+            await BookRepository.update(1, {"title": "Persuasion"})
+            return await self.search(app, "emma"), await self.search(app, "persuasion")
+
+        assert run_seeded(call) == ([], ["Persuasion"])
+
+    def test_search_follows_deletes(self, app):
+        async def call(session):
+            await self.add(session, {"title": "Emma"}, {"title": "Emma, a sequel"})
+            await BookRepository.delete(Book(id=1))
+            return await self.search(app, "emma")
+
+        assert run_seeded(call) == ["Emma, a sequel"]
+
+    def test_title_hit_ranks_above_description_hit(self, app):
+        async def call(session):
+            # Inserted first, so id order alone would put it first
+            await self.add(
+                session,
+                {"title": "Persuasion", "description": "Not Emma, whom it mentions"},
+                {"title": "Emma"},
+            )
+            return await self.search(app, "emma")
+
+        assert run_seeded(call) == ["Emma", "Persuasion"]
+
+
+class TestCheckReferences:
+    def check(self, **references):
+        async def call(session):
+            session.add(
+                Book(title="Emma", isbn="9780141439587", author_id=1, publisher_id=1)
+            )
+            await session.flush()
+            row = await BookRepository.check_references(**references)
+            return row.author_exists, row.publisher_exists, row.isbn_taken
+
+        return run_seeded(call)
+
+    def test_all_found(self):
+        assert self.check(author_id=1, publisher_id=1, isbn="9780141439587") == (
+            True,
+            True,
+            True,
+        )
+
+    def test_missing_author_and_publisher_free_isbn(self):
+        assert self.check(author_id=2, publisher_id=2, isbn="9780000000000") == (
+            False,
+            False,
+            False,
+        )
+
+    def test_skipped_checks_read_none(self):
+        assert self.check(author_id=1) == (True, None, None)
+
+
+class TestReturning:
+    def summaries(self, book):
+        # Read from the loaded state, so a missing relation is not lazy loaded
+        loaded = inspect(book).dict
+        return (
+            loaded["author"].last_name,
+            loaded["publisher"].name,
+        )
+
+    def test_create_loads_summaries(self):
+        async def call(session):
+            book = await BookRepository.create(
+                {"title": "Emma", "author_id": 1, "publisher_id": 1}
+            )
+            return book.id, book.title, self.summaries(book)
+
+        assert run_seeded(call) == (1, "Emma", ("Austen", "Penguin"))
+
+    def test_update_loads_summaries(self):
+        async def call(session):
+            await session.execute(insert(Publisher), [{"name": "Vintage"}])
+            book = await BookRepository.create(
+                {"title": "Emma", "author_id": 1, "publisher_id": 1}
+            )
+            book = await BookRepository.update(
+                book.id, {"title": "Persuasion", "publisher_id": 2}
+            )
+            return book.title, self.summaries(book)
+
+        assert run_seeded(call) == ("Persuasion", ("Austen", "Vintage"))
+
+    def test_update_missing_book(self):
+        async def call(session):
+            return await BookRepository.update(99, {"title": "Persuasion"})
+
+        assert run_seeded(call) is None
@@ -0,0 +1,146 @@
+import asyncio
+import time
+from werkzeug.datastructures import MultiDict
+from app.cache import (
+    EntityCache,
+    ResponseCache,
+    cache_missing,
+    discard,
+    lookup_entity,
+)
+
+
+class TestEntityCache:
+    def test_hit_and_miss_counters(self):
+        cache = EntityCache(maxsize=2, ttl=30)
+        assert cache.get(("book", 1)) is None
+        cache.set(("book", 1), "book")
+        assert cache.get(("book", 1)) == "book"
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 2}
+
+    def test_evicts_least_recently_used(self):
+        cache = EntityCache(maxsize=2, ttl=30)
+        cache.set(("book", 1), "one")
+        cache.set(("book", 2), "two")
+        cache.get(("book", 1))
+        cache.set(("book", 3), "three")
+        assert cache.get(("book", 2)) is None
+        assert cache.get(("book", 1)) == "one"
+
+    def test_expires_after_ttl(self, monkeypatch):
+        cache = EntityCache(maxsize=2, ttl=30)
+        cache.set(("book", 1), "book")
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 31)
+        assert cache.get(("book", 1)) is None
+        assert cache.stats()["size"] == 0
+
+    def test_invalidate_drops_dependents(self):
+        cache = EntityCache(maxsize=10, ttl=30)
+        cache.set(("author", 1), "author", depends_on=[("book", 1)])
+        cache.set(("book", 1), "book", depends_on=[("author", 1)])
+        cache.set(("book", 2), "other", depends_on=[("author", 2)])
+        cache.invalidate(("author", 1))
+        assert cache.get(("book", 1)) is None
+        assert cache.get(("book", 2)) == "other"
+
+    def test_discard_keeps_dependents(self):
+        cache = EntityCache(maxsize=10, ttl=30)
+        cache.set(("author", 1), "author")
+        cache.set(("book", 1), "book", depends_on=[("author", 1)])
+        cache.discard(("author", 1))
+        assert cache.get(("author", 1)) is None
+        assert cache.get(("book", 1)) == "book"
+
+    def test_zero_size_disables_cache(self):
+        cache = EntityCache(maxsize=0, ttl=30)
+        cache.set(("book", 1), "book")
+        assert cache.get(("book", 1)) is None
+
+
+class TestResponseCache:
+    def test_key_normalizes_query_args(self):
+        cache = ResponseCache()
+        first = cache.key(
+            "/api/books", MultiDict([("page", "2"), ("per_page", "5")]), ["books"]
+        )
+        second = cache.key(
+            "/api/books", MultiDict([("per_page", "5"), ("page", "2")]), ["books"]
+        )
+        assert first == second
+
+    def test_bump_makes_entries_unreachable(self):
+        cache = ResponseCache()
+        args = MultiDict()
+        cache.set(cache.key("/api/books", args, ["books", "authors"]), b"[]", "etag")
+        cache.bump("authors")
+        assert cache.get(cache.key("/api/books", args, ["books", "authors"])) is None
+        cache.set(cache.key("/api/publishers", args, ["publishers"]), b"[]", "etag")
+        cache.bump("books")
+        assert cache.get(cache.key("/api/publishers", args, ["publishers"])) == (
+            b"[]",
+            "etag",
+            "application/json",
+        )
+
+    def test_keyed_by_accept_header(self):
+        cache = ResponseCache()
+        args = MultiDict()
+        columnar = "application/vnd.columnar+json"
+        cache.set(
+            cache.key("/api/books", args, ["books"], columnar), b"{}", "etag", columnar
+        )
+        assert cache.get(cache.key("/api/books", args, ["books"])) is None
+        assert cache.get(cache.key("/api/books", args, ["books"], columnar)) == (
+            b"{}",
+            "etag",
+            columnar,
+        )
+
+    def test_bounded_by_body_size(self):
+        cache = ResponseCache(max_bytes=10)
+        cache.set("a", b"12345", "a")
+        cache.set("b", b"12345", "b")
+        cache.set("c", b"12345", "c")
+        assert cache.get("a") is None
+        assert cache.stats()["size"] == 10
+
+    def test_skips_bodies_over_budget(self):
+        cache = ResponseCache(max_bytes=4)
+        cache.set("a", b"12345", "a")
+        assert cache.get("a") is None
+        assert cache.stats()["size"] == 0
+
+
+class TestNegativeCache:
+    def test_missing_entry_is_a_hit(self, app):
+        async def run():
+            async with app.app_context():
+                cache_missing(("book", 1))
+                return lookup_entity(("book", 1))
+
+        assert asyncio.run(run()) == (True, None)
+
+    def test_discard_clears_missing_entry(self, app):
+        async def run():
+            async with app.app_context():
+                cache_missing(("book", 1))
+                discard(("book", 1))
+                return lookup_entity(("book", 1))
+
+        assert asyncio.run(run()) == (False, None)
+
+    def test_counted_in_negative_counters_only(self, app):
+        async def run():
+            async with app.app_context():
+                cache_missing(("book", 1))
+                lookup_entity(("book", 1))
+                lookup_entity(("book", 2))
+                return (
+                    app.entity_cache.stats()["misses"],
+                    app.negative_cache.stats()["hits"],
+                    app.negative_cache.stats()["misses"],
+                )
+
+        # Only book 2, which is not cached either way, misses the entity cache
+        assert asyncio.run(run()) == (1, 1, 1)
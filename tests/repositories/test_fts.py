@@ -0,0 +1,12 @@
+from app.repositories.fts import fts_query
+
+
+class TestFtsQuery:
+    def test_prefix_match_per_word(self):
+        assert fts_query("pride prej") == '"pride"* "prej"*'
+
+    def test_strips_fts_syntax(self):
+        assert fts_query('title: "x" OR -y') == '"title"* "x"* "OR"* "y"*'
+
+    def test_no_words(self):
+        assert fts_query("  --  ") is None
@@ -0,0 +1,143 @@
+import asyncio
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.future import select
+from app.models import Base, Publisher
+from app.repositories.pagination import (
+    Pagination,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+    seek,
+    stream_batches,
+)
+
+
+class TestPagination:
+    def test_pages_rounds_up(self):
+        pagination = Pagination(items=[], page=1, per_page=10, total=25)
+        assert pagination.pages == 3
+
+    def test_pages_exact_multiple(self):
+        pagination = Pagination(items=[], page=1, per_page=10, total=20)
+        assert pagination.pages == 2
+
+    def test_pages_empty(self):
+        pagination = Pagination(items=[], page=1, per_page=10, total=0)
+        assert pagination.pages == 0
+
+
+class TestCursor:
+    def test_round_trip(self, app):
+        async def run():
+            async with app.app_context():
+                cursor = encode_cursor(["Emma", 7], "books")
+                return decode_cursor(cursor, "books")
+
+        assert asyncio.run(run()) == ["Emma", 7]
+
+    def test_rejects_tampered_cursor(self, app):
+        async def run():
+            async with app.app_context():
+                cursor = encode_cursor(["Emma", 7], "books")
+                decode_cursor(cursor[:-1] + "x", "books")
+
+        with pytest.raises(ValueError):
+            asyncio.run(run())
+
+    def test_rejects_cursor_from_other_scope(self, app):
+        async def run():
+            async with app.app_context():
+                cursor = encode_cursor(["Austen", 1], "authors")
+                decode_cursor(cursor, "books")
+
+        with pytest.raises(ValueError):
+            asyncio.run(run())
+
+
+class TestStreamBatches:
+    def stream(self, count, batch_size):
+        async def run():
+            engine = create_async_engine("sqlite+aiosqlite://")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+                if count:
+                    rows = [{"name": f"Publisher {i}"} for i in range(count)]
+                    await conn.execute(insert(Publisher), rows)
+            async with AsyncSession(engine) as session:
+                stmt = select(Publisher.id, Publisher.name).order_by(Publisher.id)
+                batches = [
+                    batch async for batch in stream_batches(session, stmt, batch_size)
+                ]
+            await engine.dispose()
+            return batches
+
+        return asyncio.run(run())
+
+    def test_batches_of_batch_size(self):
+        batches = self.stream(25, 10)
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+        assert [row.id for batch in batches for row in batch] == list(range(1, 26))
+        assert batches[0][0].name == "Publisher 0"
+
+    def test_empty(self):
+        assert self.stream(0, 10) == []
+
+
+class TestRows:
+    def run(self, query):
+        async def run():
+            engine = create_async_engine("sqlite+aiosqlite://")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+                rows = [{"name": f"Publisher {i}"} for i in range(5)]
+                await conn.execute(insert(Publisher), rows)
+            async with AsyncSession(engine) as session:
+                stmt = select(Publisher.name.label("name"), Publisher.id.label("id"))
+                page = await query(session, stmt)
+            await engine.dispose()
+            return page
+
+        return asyncio.run(run())
+
+    def test_paginate_rows(self):
+        page = self.run(
+            lambda session, stmt: paginate(
+                session, stmt.order_by(Publisher.id), 2, 2, rows=True
+            )
+        )
+        assert page.columns == ["name", "id"]
+        assert [tuple(row) for row in page.items] == [
+            ("Publisher 2", 3),
+            ("Publisher 3", 4),
+        ]
+        assert page.total == 5
+
+    def test_seek_rows(self):
+        key_columns = (Publisher.name, Publisher.id)
+        page = self.run(
+            lambda session, stmt: seek(
+                session, stmt, key_columns, ["Publisher 0", 1], 2, rows=True
+            )
+        )
+        assert page.columns == ["name", "id"]
+        assert [row.id for row in page.items] == [2, 3]
+        assert page.next_key == ["Publisher 2", 3]
+
+    def test_non_positive_per_page_is_one(self):
+        for per_page in (0, -1):
+            page = self.run(
+                lambda session, stmt: paginate(
+                    session, stmt.order_by(Publisher.id), 1, per_page, rows=True
+                )
+            )
+            assert len(page.items) == 1
+            assert (page.per_page, page.pages) == (1, 5)
+        page = self.run(
+            lambda session, stmt: seek(
+                session, stmt, (Publisher.id,), None, 0, rows=True
+            )
+        )
+        assert [row.id for row in page.items] == [1]
+        assert page.next_key == [1]
@@ -0,0 +1,40 @@
+from sqlalchemy.future import select
+from sqlalchemy.orm import selectinload
+from app.models import Author, Book
+from app.repositories.projection import load_fields, wants_previews
+
+
+def selected_columns(model, *options):
+    sql = str(select(model).options(*options))
+    return sql.split("FROM")[0]
+
+
+class TestLoadFields:
+    def test_loads_requested_and_version_columns(self):
+        sql = selected_columns(Book, *load_fields(Book, ("price", "title")))
+        assert "books.price" in sql
+        assert "books.title" in sql
+        assert "books.updated_at" in sql
+        assert "books.description" not in sql
+        assert "books.author_id" not in sql
+
+    def test_relation_loads_its_foreign_key(self):
+        loader = selectinload(Book.author)
+        options = load_fields(Book, ("id", "author"), {"author": loader})
+        assert loader in options
+        assert "books.author_id" in selected_columns(Book, *options)
+
+    def test_required_columns(self):
+        sql = selected_columns(
+            Author, *load_fields(Author, ("id",), required=("last_name",))
+        )
+        assert "authors.last_name" in sql
+        assert "authors.biography" not in sql
+
+
+class TestWantsPreviews:
+    def test_previews_only_for_book_fields(self):
+        assert wants_previews(None)
+        assert wants_previews(("books_count",))
+        assert wants_previews(("books", "id"))
+        assert not wants_previews(("id", "last_name"))
@@ -2,6 +2,7 @@ import pytest
 from app.repositories.publisher_repository import PublisherRepository
 from app.models.publisher import Publisher
 from app.models.book import Book
+from tests.repositories.test_author_repository import seek_all
 import datetime
 
 
@@ -151,3 +152,21 @@ class TestPublisherRepository:
         # Test with no match
         result = PublisherRepository.search_by_name("XYZ", page=1, per_page=10)
         assert len(result.items) == 0
+
+
+class TestFilteredSeek:
+    def test_cursor_seeks_within_name_filter(self, app):
+        rows = [
+            {"name": name} for name in ["Packt", "No Starch Press", "Apress", "Manning"]
+        ]
+
+        async def call(after):
+            async with app.app_context():
+                return await PublisherRepository.get_all_after(
+                    after, per_page=1, name="press"
+                )
+
+        publishers = seek_all(
+            Publisher, rows, "app.repositories.publisher_repository", call
+        )
+        assert [p.name for p in publishers] == ["Apress", "No Starch Press"]
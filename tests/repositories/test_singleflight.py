@@ -0,0 +1,112 @@
+import asyncio
+from unittest.mock import patch
+import pytest
+from quart import g
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from app.models import Author, Base, Book, Publisher
+from app.repositories.book_repository import BookRepository
+from app.repositories.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        calls = []
+
+        async def query():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "rows"
+
+        async def run():
+            return await asyncio.gather(*[flight.do("key", query) for _ in range(5)])
+
+        assert asyncio.run(run()) == ["rows"] * 5
+        assert len(calls) == 1
+        assert flight.stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+    def test_errors_reach_every_caller(self):
+        flight = SingleFlight()
+
+        async def query():
+            await asyncio.sleep(0.01)
+            raise Exception("Error fetching books")
+
+        async def run():
+            return await asyncio.gather(
+                *[flight.do("key", query) for _ in range(3)], return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+        assert [str(result) for result in results] == ["Error fetching books"] * 3
+
+    def test_followers_retry_when_leader_is_cancelled(self):
+        flight = SingleFlight()
+
+        async def query():
+            await asyncio.sleep(0.01)
+            return "rows"
+
+        async def run():
+            leader = asyncio.ensure_future(flight.do("key", query))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.do("key", query))
+            await asyncio.sleep(0)
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            return await follower
+
+        assert asyncio.run(run()) == "rows"
+        assert flight.stats()["calls"] == 2
+
+
+class TestCoalesced:
+    def test_follower_keeps_list_when_leader_rolls_back(self, app):
+        async def run():
+            engine = create_async_engine("sqlite+aiosqlite://")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+                await conn.execute(
+                    insert(Author), [{"first_name": "Jane", "last_name": "Austen"}]
+                )
+                await conn.execute(insert(Publisher), [{"name": "Penguin"}])
+                await conn.execute(
+                    insert(Book),
+                    [{"title": "Emma", "author_id": 1, "publisher_id": 1}],
+                )
+            rolled_back = asyncio.Event()
+
+            async def leader():
+                async with app.app_context():
+                    g.db_session = AsyncSession(engine)
+                    with patch(
+                        "app.repositories.book_repository.get_session",
+                        return_value=g.db_session,
+                    ):
+                        page = await BookRepository.get_all()
+                    # The leader's request fails after the shared read
+                    await g.db_session.rollback()
+                    rolled_back.set()
+                    return page
+
+            async def follower():
+                async with app.app_context():
+                    page = await BookRepository.get_all()
+                    await rolled_back.wait()
+                    return page, [
+                        (book.title, book.author.last_name, book.publisher.name)
+                        for book in page.items
+                    ]
+
+            leading = asyncio.ensure_future(leader())
+            await asyncio.sleep(0)
+            page, (follower_page, books) = await asyncio.gather(leading, follower())
+            await engine.dispose()
+            return page is follower_page, books
+
+        shared, books = asyncio.run(run())
+        assert shared
+        assert app.single_flight.stats()["coalesced"] == 1
+        assert books == [("Emma", "Austen", "Penguin")]
@@ -0,0 +1,78 @@
+import asyncio
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.models import Base
+from app.models.upgrade import upgrade_database
+
+# What a database created before the search tables and indexes looks like
+_downgrade = [
+    "DROP TRIGGER books_fts_ai",
+    "DROP TRIGGER books_fts_ad",
+    "DROP TRIGGER books_fts_au",
+    "DROP TRIGGER authors_fts_ai",
+    "DROP TRIGGER authors_fts_ad",
+    "DROP TRIGGER authors_fts_au",
+    "DROP TABLE books_fts",
+    "DROP TABLE authors_fts",
+    "DROP INDEX ix_books_title_id",
+    "DROP INDEX ix_books_author_id",
+    "DROP INDEX ix_books_publisher_id",
+    "DROP INDEX ix_authors_last_name_id",
+    "DROP INDEX ix_authors_search_name",
+    "DROP INDEX ix_publishers_name_id",
+    "ALTER TABLE authors DROP COLUMN search_name",
+    "INSERT INTO authors (id, first_name, last_name) VALUES (1, 'Émile', 'Zola')",
+    "INSERT INTO publishers (id, name) VALUES (1, 'Charpentier')",
+    "INSERT INTO books (id, title, author_id, publisher_id)"
+    " VALUES (1, 'Germinal', 1, 1)",
+]
+
+
+def upgraded(times=1):
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            for statement in _downgrade:
+                await conn.execute(text(statement))
+        for _ in range(times):
+            await upgrade_database(engine)
+        async with engine.connect() as conn:
+            indexes = await conn.run_sync(
+                lambda sync: {
+                    index["name"]
+                    for table in ("books", "authors", "publishers")
+                    for index in inspect(sync).get_indexes(table)
+                }
+            )
+            search_name = await conn.scalar(text("SELECT search_name FROM authors"))
+            books = await conn.scalars(
+                text("SELECT rowid FROM books_fts WHERE books_fts MATCH 'germinal'")
+            )
+            authors = await conn.scalars(
+                text("SELECT rowid FROM authors_fts WHERE authors_fts MATCH 'emi*'")
+            )
+            result = indexes, search_name, list(books), list(authors)
+        await engine.dispose()
+        return result
+
+    return asyncio.run(run())
+
+
+class TestUpgradeDatabase:
+    def test_adds_indexes_and_search_tables(self):
+        indexes, search_name, books, authors = upgraded()
+        assert {
+            "ix_books_title_id",
+            "ix_books_author_id",
+            "ix_books_publisher_id",
+            "ix_authors_last_name_id",
+            "ix_authors_search_name",
+            "ix_publishers_name_id",
+        } <= indexes
+        assert search_name == "emile zola"
+        assert books == [1]
+        assert authors == [1]
+
+    def test_idempotent(self):
+        assert upgraded(times=2) == upgraded()
@@ -1,5 +1,7 @@
-from unittest.mock import patch, MagicMock
+import asyncio
+from unittest.mock import AsyncMock, patch, MagicMock
 import datetime
+from types import SimpleNamespace
 from app.services.book_service import BookService
 from app.models.book import Book
 from app.models.author import Author
@@ -263,3 +265,212 @@ class TestBookService:
         assert result["success"] is False
         assert result["message"] == "Book not found"
         mock_get_by_id.assert_called_once_with(999)
+
+
+class TestBulkCreate:
+    def bulk_create(self, books, errors=None, references=({1}, {1}, set())):
+        async def run():
+            with patch(
+                "app.services.book_service.BookRepository.find_references",
+                AsyncMock(return_value=tuple(set(found) for found in references)),
+            ) as find, patch(
+                "app.services.book_service.BookRepository.create_many",
+                AsyncMock(side_effect=lambda rows, _: list(range(10, 10 + len(rows)))),
+            ) as create_many, patch(
+                "app.services.book_service.discard"
+            ) as discard, patch(
+                "app.services.book_service.bump_generation"
+            ) as bump:
+                result = await BookService.bulk_create(books, errors, 500)
+                return result, find, create_many, discard, bump
+
+        return asyncio.run(run())
+
+    def test_checks_all_rows_with_one_lookup(self):
+        books = {
+            0: {
+                "title": "A",
+                "isbn": "9780000000001",
+                "author_id": 1,
+                "publisher_id": 1,
+            },
+            1: {"title": "B", "author_id": 2, "publisher_id": 1},
+            2: {"title": "C", "author_id": 1, "publisher_id": 3},
+            3: {
+                "title": "D",
+                "isbn": "9780000000002",
+                "author_id": 1,
+                "publisher_id": 1,
+            },
+        }
+        (result, status_code), find, create_many, discard, bump = self.bulk_create(
+            books, references=({1}, {1}, {"9780000000002"})
+        )
+        find.assert_awaited_once_with(
+            {1, 2}, {1, 3}, {"9780000000001", "9780000000002"}, 500
+        )
+        assert status_code == 207
+        assert result["created"] == 1
+        assert result["failed"] == 3
+        assert [row.get("message") for row in result["data"]] == [
+            None,
+            "Author not found",
+            "Publisher not found",
+            "ISBN already exists",
+        ]
+        assert result["data"][0] == {"index": 0, "success": True, "id": 10}
+        (rows, batch_size), _ = create_many.await_args
+        assert [row["title"] for row in rows] == ["A"]
+        assert batch_size == 500
+        discard.assert_called_once()
+        assert set(discard.call_args.args) == {
+            ("book", 10),
+            ("author", 1),
+            ("publisher", 1),
+        }
+        bump.assert_called_once_with("books")
+
+    def test_isbn_repeated_within_request(self):
+        book = {"isbn": "9780000000001", "author_id": 1, "publisher_id": 1}
+        (result, status_code), *_ = self.bulk_create({0: book, 1: dict(book)})
+        assert status_code == 207
+        assert result["data"][1]["message"] == "ISBN already exists"
+
+    def test_validation_errors_keep_request_order(self):
+        books = {1: {"title": "B", "author_id": 1, "publisher_id": 1}}
+        errors = {0: {"title": ["Missing data for required field."]}}
+        (result, status_code), *_ = self.bulk_create(books, errors)
+        assert status_code == 207
+        assert [row["index"] for row in result["data"]] == [0, 1]
+        assert result["data"][0]["errors"] == errors[0]
+
+    def test_nothing_created(self):
+        books = {0: {"title": "A", "author_id": 2, "publisher_id": 1}}
+        (result, status_code), _, _, discard, bump = self.bulk_create(books)
+        assert status_code == 400
+        assert result["success"] is False
+        assert result["message"] == "No books were created"
+        discard.assert_not_called()
+        bump.assert_not_called()
+
+    def test_all_created(self):
+        books = {
+            i: {"title": f"B{i}", "author_id": 1, "publisher_id": 1} for i in range(3)
+        }
+        (result, status_code), *_ = self.bulk_create(books)
+        assert status_code == 201
+        assert result["success"] is True
+        assert [row["id"] for row in result["data"]] == [10, 11, 12]
+
+
+class TestCheckReferences:
+    def run(self, call, checks=(True, True, False)):
+        author_exists, publisher_exists, isbn_taken = checks
+        book = Book(
+            id=1, title="Emma", isbn="9780141439587", author_id=1, publisher_id=1
+        )
+
+        async def run():
+            with patch(
+                "app.services.book_service.BookRepository.check_references",
+                AsyncMock(
+                    return_value=SimpleNamespace(
+                        author_exists=author_exists,
+                        publisher_exists=publisher_exists,
+                        isbn_taken=isbn_taken,
+                    )
+                ),
+            ) as check, patch(
+                "app.services.book_service.BookRepository.get_by_id",
+                AsyncMock(return_value=book),
+            ), patch(
+                "app.services.book_service.BookRepository.create",
+                AsyncMock(return_value=book),
+            ) as create, patch(
+                "app.services.book_service.BookRepository.update",
+                AsyncMock(return_value=book),
+            ) as update, patch(
+                "app.services.book_service.invalidate"
+            ), patch(
+                "app.services.book_service.discard"
+            ), patch(
+                "app.services.book_service.bump_generation"
+            ):
+                result = await call()
+                return result, check, create.await_count + update.await_count
+
+        return asyncio.run(run())
+
+    def create(self, **book_data):
+        return lambda: BookService.create(
+            {"title": "Emma", "author_id": 1, "publisher_id": 1, **book_data}
+        )
+
+    def test_create_author_not_found(self):
+        (result, status_code), check, writes = self.run(
+            self.create(), checks=(False, True, False)
+        )
+        assert (status_code, result["message"]) == (404, "Author not found")
+        check.assert_awaited_once_with(author_id=1, publisher_id=1, isbn=None)
+        assert writes == 0
+
+    def test_create_publisher_not_found(self):
+        (result, status_code), _, writes = self.run(
+            self.create(), checks=(True, False, False)
+        )
+        assert (status_code, result["message"]) == (404, "Publisher not found")
+        assert writes == 0
+
+    def test_create_isbn_taken(self):
+        (result, status_code), check, writes = self.run(
+            self.create(isbn="9780141439587"), checks=(True, True, True)
+        )
+        assert (status_code, result["message"]) == (400, "ISBN already exists")
+        check.assert_awaited_once_with(
+            author_id=1, publisher_id=1, isbn="9780141439587"
+        )
+        assert writes == 0
+
+    def test_create_checks_pass(self):
+        (result, status_code), _, writes = self.run(self.create())
+        assert status_code == 201
+        assert result["message"] == "Book created successfully"
+        assert writes == 1
+
+    def test_update_author_not_found(self):
+        (result, status_code), check, writes = self.run(
+            lambda: BookService.update(1, {"author_id": 2}), checks=(False, None, None)
+        )
+        assert (status_code, result["message"]) == (404, "Author not found")
+        check.assert_awaited_once_with(author_id=2, publisher_id=None, isbn=None)
+        assert writes == 0
+
+    def test_update_publisher_not_found(self):
+        (result, status_code), _, writes = self.run(
+            lambda: BookService.update(1, {"publisher_id": 2}),
+            checks=(None, False, None),
+        )
+        assert (status_code, result["message"]) == (404, "Publisher not found")
+        assert writes == 0
+
+    def test_update_isbn_taken(self):
+        (result, status_code), check, writes = self.run(
+            lambda: BookService.update(1, {"isbn": "9780000000000"}),
+            checks=(None, None, True),
+        )
+        assert (status_code, result["message"]) == (400, "ISBN already exists")
+        check.assert_awaited_once_with(
+            author_id=None, publisher_id=None, isbn="9780000000000"
+        )
+        assert writes == 0
+
+    def test_update_unchanged_isbn_is_not_checked(self):
+        # The book's own ISBN would otherwise read as taken
+        (result, status_code), check, writes = self.run(
+            lambda: BookService.update(1, {"isbn": "9780141439587", "title": "E"}),
+            checks=(None, None, True),
+        )
+        assert status_code == 200
+        assert result["message"] == "Book updated successfully"
+        check.assert_not_awaited()
+        assert writes == 1
@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from quart import Quart
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.future import select
+from sqlalchemy.orm import sessionmaker
+from werkzeug.security import check_password_hash, generate_password_hash
+from app.models import Base
+from app.models.user import User
+from app.passwords import PasswordHasher
+
+
+class TestPasswordHasher:
+    @pytest.mark.parametrize("max_workers", [0, 2])
+    def test_hash_and_verify(self, max_workers):
+        hasher = PasswordHasher(max_workers=max_workers)
+
+        async def run():
+            password_hash = await hasher.hash("password123")
+            return (
+                await hasher.verify(password_hash, "password123"),
+                await hasher.verify(password_hash, "wrong"),
+            )
+
+        try:
+            assert asyncio.run(run()) == (True, False)
+        finally:
+            hasher.shutdown()
+
+    def test_needs_rehash_after_parameter_change(self):
+        old = PasswordHasher("pbkdf2:sha256:1000", 0)
+        new = PasswordHasher("pbkdf2:sha256:2000", 0)
+
+        async def run():
+            password_hash = await old.hash("password123")
+            return (
+                await old.needs_rehash(password_hash),
+                await new.needs_rehash(password_hash),
+            )
+
+        assert asyncio.run(run()) == (False, True)
+
+
+class TestUserPassword:
+    def test_plaintext_password_uses_configured_method(self):
+        app = Quart(__name__)
+        app.config["PASSWORD_HASH_METHOD"] = "pbkdf2:sha256:1000"
+
+        async def run():
+            async with app.app_context():
+                return User("reader", "reader@example.com", password="password123")
+
+        user = asyncio.run(run())
+        assert user.password_hash.startswith("pbkdf2:sha256:1000$")
+        assert user.check_password("password123")
+
+
+class TestLoginRehash:
+    def test_old_hash_is_replaced_after_login(self, app, tmp_path):
+        method = "pbkdf2:sha256:2000"
+        app.config["PASSWORD_HASH_METHOD"] = method
+        app.password_hasher = PasswordHasher(method, 0)
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+        app.async_session = sessionmaker(
+            engine, expire_on_commit=False, class_=AsyncSession
+        )
+        old_hash = generate_password_hash("password123", "pbkdf2:sha256:1000")
+
+        async def run():
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+                await conn.execute(
+                    insert(User),
+                    [
+                        {
+                            "username": "reader",
+                            "email": "reader@example.com",
+                            "password_hash": old_hash,
+                        }
+                    ],
+                )
+            # Shutting the app down waits for its background tasks
+            async with app.test_app() as test_app:
+                response = await test_app.test_client().post(
+                    "/api/auth/login",
+                    json={"email": "reader@example.com", "password": "password123"},
+                )
+            async with app.async_session() as session:
+                stored = await session.scalar(select(User.password_hash))
+            await engine.dispose()
+            return response.status_code, stored
+
+        status_code, stored = asyncio.run(run())
+        assert status_code == 200
+        assert stored != old_hash
+        assert stored.startswith(f"{method}$")
+        assert check_password_hash(stored, "password123")